@@ -6,25 +6,26 @@
 # -- Project information -----------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#project-information
 from datetime import date
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
 from typing import Any
 
-from gatekeeper import __version__
-
 project = "GateKeeper"
-copyright = "2026, Sneha S"
 author = "Sneha S"
 
 start_year = 2026
-if date.today().year == start_year:
-    copyright = f"{date.today().year}, {author}"
+current_year = date.today().year
+if current_year == start_year:
+    copyright = f"{current_year}, {author}"
 else:
-    copyright = f"{start_year} - {date.today().year}, {author}"
+    copyright = f"{start_year} - {current_year}, {author}"
 
 
 release = "0.1.0"
 try:
-    version = __version__
-except Exception:
+    # Read from installed metadata so the docs build doesn't need to import gatekeeper
+    version = package_version("gatekeeper")
+except PackageNotFoundError:
     version = "0.1.0"
 
 # -- General configuration ---------------------------------------------------
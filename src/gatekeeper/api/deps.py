@@ -1,16 +1,25 @@
 from typing import Annotated
 
 from fastapi import Cookie, Depends, HTTPException, status
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gatekeeper.database import get_db
+from gatekeeper.models.app import App
 from gatekeeper.models.user import User, UserStatus
+from gatekeeper.services.email import EmailService
+from gatekeeper.services.otp import OTPService
+from gatekeeper.services.passkey import PasskeyService
 from gatekeeper.services.session import SessionService
 from gatekeeper.utils.security import verify_signed_token
 
 
+def get_session_service(db: Annotated[AsyncSession, Depends(get_db)]) -> SessionService:
+    return SessionService(db)
+
+
 async def get_current_user(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    session_service: Annotated[SessionService, Depends(get_session_service)],
     session: Annotated[str | None, Cookie()] = None,
 ) -> User:
     if not session:
@@ -26,7 +35,6 @@ async def get_current_user(
             detail="Invalid session",
         )
 
-    session_service = SessionService(db)
     user = await session_service.get_user_by_token(token)
 
     if not user:
@@ -75,7 +83,44 @@ async def get_admin_user(
     return current_user
 
 
+async def get_app_by_slug(slug: str, db: Annotated[AsyncSession, Depends(get_db)]) -> App:
+    # Built once per call site; later calls only rebind `slug`
+    stmt = lambda_stmt(lambda: select(App).where(App.slug == slug))
+    result = await db.execute(stmt)
+    app = result.scalar_one_or_none()
+
+    if not app:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"App '{slug}' not found",
+        )
+    return app
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
+    stmt = lambda_stmt(lambda: select(User).where(User.email == email))
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+def get_email_service(db: Annotated[AsyncSession, Depends(get_db)]) -> EmailService:
+    return EmailService(db=db)
+
+
+def get_otp_service(db: Annotated[AsyncSession, Depends(get_db)]) -> OTPService:
+    return OTPService(db)
+
+
+def get_passkey_service(db: Annotated[AsyncSession, Depends(get_db)]) -> PasskeyService:
+    return PasskeyService(db)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 CurrentUserOptional = Annotated[User | None, Depends(get_current_user_optional)]
 AdminUser = Annotated[User, Depends(get_admin_user)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+AppBySlug = Annotated[App, Depends(get_app_by_slug)]
+EmailServiceDep = Annotated[EmailService, Depends(get_email_service)]
+OTPServiceDep = Annotated[OTPService, Depends(get_otp_service)]
+PasskeyServiceDep = Annotated[PasskeyService, Depends(get_passkey_service)]
+SessionServiceDep = Annotated[SessionService, Depends(get_session_service)]
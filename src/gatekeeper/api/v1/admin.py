@@ -1,10 +1,21 @@
 import uuid
-from datetime import UTC, datetime
-
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import func, select
-
-from gatekeeper.api.deps import AdminUser, DbSession
+from functools import partial
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Response, status
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.orm import selectinload
+
+from gatekeeper.api.deps import (
+    AdminUser,
+    AppBySlug,
+    DbSession,
+    EmailServiceDep,
+    get_app_by_slug,
+    get_user_by_email,
+)
+from gatekeeper.config import get_settings
+from gatekeeper.database import after_commit, dialect_insert
 from gatekeeper.models.app import AccessRequestStatus, App, AppAccessRequest, UserAppAccess
 from gatekeeper.models.user import User, UserStatus
 from gatekeeper.schemas.admin import AdminCreateUser, AdminUpdateUser, PendingUserList, UserList
@@ -22,14 +33,53 @@ from gatekeeper.schemas.app import (
 )
 from gatekeeper.schemas.auth import ErrorResponse, MessageResponse
 from gatekeeper.schemas.user import UserRead
-from gatekeeper.services.email import EmailService
+from gatekeeper.services.admin_cache import (
+    AccessRequestListKey,
+    cache_access_request_list,
+    clear_access_request_lists,
+    clear_admin_emails,
+    get_access_request_list,
+)
+from gatekeeper.services.email import EmailService, send_concurrently
+from gatekeeper.services.session import clear_access_decisions
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
 
+# Columns backing UserRead, selected directly so list endpoints skip ORM instance hydration
+_user_read_columns = (
+    User.id,
+    User.email,
+    User.name,
+    User.status,
+    User.is_admin,
+    User.is_seeded,
+    User.notify_private_app_requests,
+    User.created_at,
+    User.updated_at,
+)
+
+
+_access_request_list_adapter = TypeAdapter(list[AccessRequestRead])
+
+
+def _json_response(model: BaseModel) -> Response:
+    # The model is already validated, so skip FastAPI's second pass through response_model
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _access_request_response(
+    cache_key: AccessRequestListKey, access_requests: list[AccessRequestRead]
+) -> Response:
+    body = _access_request_list_adapter.dump_json(access_requests)
+    cache_access_request_list(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
 @router.get(
     "/users",
-    response_model=UserList,
+    response_model=None,
+    responses={200: {"model": UserList}},
     summary="List all users",
     description="List all users with pagination. Admin only.",
 )
@@ -39,27 +89,43 @@ async def list_users(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status_filter: UserStatus | None = Query(None, description="Filter by status"),
-) -> UserList:
+) -> Response:
     offset = (page - 1) * page_size
 
-    count_stmt = select(func.count(User.id))
-    query_stmt = select(User).order_by(User.created_at.desc()).offset(offset).limit(page_size)
-
+    # The total rides along on every row, so one query serves both the page and the count
+    query_stmt = (
+        select(*_user_read_columns, func.count().over().label("total"))
+        .order_by(User.created_at.desc())
+        .offset(offset)
+        .limit(page_size)
+    )
     if status_filter:
-        count_stmt = count_stmt.where(User.status == status_filter)
         query_stmt = query_stmt.where(User.status == status_filter)
 
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
     result = await db.execute(query_stmt)
-    users = result.scalars().all()
-
-    return UserList(
-        users=[UserRead.model_validate(u) for u in users],
-        total=total,
-        page=page,
-        page_size=page_size,
+    rows = result.mappings().all()
+
+    if rows:
+        total = rows[0]["total"]
+    elif offset:
+        # Page past the end returns no rows to carry the count
+        count_stmt = select(func.count(User.id))
+        if status_filter:
+            count_stmt = count_stmt.where(User.status == status_filter)
+        total_result = await db.execute(count_stmt)
+        total = total_result.scalar() or 0
+    else:
+        total = 0
+
+    # Rows come straight from the database and their keys are UserRead's fields (plus
+    # total, which model_construct drops), so build the models without re-validating
+    return _json_response(
+        UserList(
+            users=[UserRead.model_construct(**row) for row in rows],
+            total=total,
+            page=page,
+            page_size=page_size,
+        )
     )
 
 
@@ -70,18 +136,16 @@ async def list_users(
     description="List all users with pending registration status. Admin only.",
 )
 async def list_pending_users(admin: AdminUser, db: DbSession) -> PendingUserList:
-    count_stmt = select(func.count(User.id)).where(User.status == UserStatus.PENDING)
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
-    stmt = select(User).where(User.status == UserStatus.PENDING).order_by(User.created_at.asc())
+    stmt = (
+        select(*_user_read_columns)
+        .where(User.status == UserStatus.PENDING)
+        .order_by(User.created_at.asc())
+    )
     result = await db.execute(stmt)
-    users = result.scalars().all()
+    users = [UserRead.model_construct(**row) for row in result.mappings()]
 
-    return PendingUserList(
-        users=[UserRead.model_validate(u) for u in users],
-        total=total,
-    )
+    # Unpaginated, so the row count is the total
+    return PendingUserList(users=users, total=len(users))
 
 
 @router.get(
@@ -95,9 +159,7 @@ async def list_pending_users(admin: AdminUser, db: DbSession) -> PendingUserList
     description="Get details of a specific user. Admin only.",
 )
 async def get_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> UserRead:
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -119,22 +181,23 @@ async def get_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> UserR
     summary="Create user",
     description="Create a new user directly. Admin only.",
 )
-async def create_user(request: AdminCreateUser, admin: AdminUser, db: DbSession) -> UserRead:
-    email = request.email.lower()
+async def create_user(
+    request: AdminCreateUser,
+    admin: AdminUser,
+    db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
+) -> UserRead:
+    email = request.email
 
     # Check if email is suppressed (bounced/complained)
-    email_service = EmailService(db=db)
     if await email_service.is_suppressed(email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="This email address is blocked due to previous delivery issues",
         )
 
-    stmt = select(User).where(User.email == email)
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
-
-    if existing:
+    if await get_user_by_email(db, email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
@@ -147,12 +210,17 @@ async def create_user(request: AdminCreateUser, admin: AdminUser, db: DbSession)
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
+    if user.is_admin:
+        after_commit(db, clear_admin_emails)
 
     # Only send welcome email to super admins
     # Regular users will only receive emails when granted access to specific apps
-    if request.auto_approve and request.is_admin:
-        await email_service.send_super_admin_welcome(email, admin.email)
+    if (
+        request.auto_approve
+        and request.is_admin
+        and (mailer := await email_service.for_background(email))
+    ):
+        background.add_task(mailer.send_super_admin_welcome, email, admin.email)
 
     return UserRead.model_validate(user)
 
@@ -173,6 +241,8 @@ async def update_user(
     request: AdminUpdateUser,
     admin: AdminUser,
     db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
 ) -> UserRead:
     if user_id == admin.id:
         raise HTTPException(
@@ -180,9 +250,7 @@ async def update_user(
             detail="Cannot modify your own account through this endpoint",
         )
 
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -197,13 +265,17 @@ async def update_user(
 
     if request.is_admin is not None:
         user.is_admin = request.is_admin
+        after_commit(db, clear_admin_emails)
 
     await db.flush()
-    await db.refresh(user)
+    after_commit(db, clear_access_decisions)
 
-    if was_pending and user.status == UserStatus.APPROVED:
-        email_service = EmailService(db=db)
-        await email_service.send_registration_approved(user.email)
+    if (
+        was_pending
+        and user.status == UserStatus.APPROVED
+        and (mailer := await email_service.for_background(user.email))
+    ):
+        background.add_task(mailer.send_registration_approved, user.email)
 
     return UserRead.model_validate(user)
 
@@ -219,10 +291,14 @@ async def update_user(
     summary="Approve registration",
     description="Approve a pending user registration. Admin only.",
 )
-async def approve_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> UserRead:
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+async def approve_user(
+    user_id: uuid.UUID,
+    admin: AdminUser,
+    db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
+) -> UserRead:
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -238,10 +314,9 @@ async def approve_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> U
 
     user.status = UserStatus.APPROVED
     await db.flush()
-    await db.refresh(user)
 
-    email_service = EmailService(db=db)
-    await email_service.send_registration_approved(user.email)
+    if mailer := await email_service.for_background(user.email):
+        background.add_task(mailer.send_registration_approved, user.email)
 
     return UserRead.model_validate(user)
 
@@ -258,9 +333,7 @@ async def approve_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> U
     description="Reject a pending user registration. Admin only.",
 )
 async def reject_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> UserRead:
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -276,7 +349,6 @@ async def reject_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> Us
 
     user.status = UserStatus.REJECTED
     await db.flush()
-    await db.refresh(user)
 
     return UserRead.model_validate(user)
 
@@ -299,9 +371,7 @@ async def delete_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> Me
             detail="Cannot delete your own account",
         )
 
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await db.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -310,7 +380,10 @@ async def delete_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> Me
         )
 
     await db.delete(user)
-    await db.flush()
+    after_commit(db, clear_access_request_lists)
+    after_commit(db, clear_access_decisions)
+    if user.is_admin:
+        after_commit(db, clear_admin_emails)
 
     return MessageResponse(message="User deleted successfully")
 
@@ -322,34 +395,42 @@ async def delete_user(user_id: uuid.UUID, admin: AdminUser, db: DbSession) -> Me
 
 @router.get(
     "/apps",
-    response_model=AppList,
+    response_model=None,
+    responses={200: {"model": AppList}},
     summary="List all apps",
     description="List all registered apps. Admin only.",
 )
-async def list_apps(admin: AdminUser, db: DbSession) -> AppList:
-    count_stmt = select(func.count(App.id))
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-
-    stmt = select(App).order_by(App.created_at.desc())
+async def list_apps(admin: AdminUser, db: DbSession) -> Response:
+    stmt = select(
+        App.id,
+        App.slug,
+        App.name,
+        App.is_public,
+        App.description,
+        App.app_url,
+        App.roles,
+        App.created_at,
+    ).order_by(App.created_at.desc())
     result = await db.execute(stmt)
-    apps = result.scalars().all()
-
-    return AppList(
-        apps=[
-            AppRead(
-                id=str(a.id),
-                slug=a.slug,
-                name=a.name,
-                is_public=a.is_public,
-                description=a.description,
-                app_url=a.app_url,
-                roles=a.roles,
-                created_at=a.created_at,
-            )
-            for a in apps
-        ],
-        total=total,
+    apps = result.all()
+
+    return _json_response(
+        AppList(
+            apps=[
+                AppRead.model_construct(
+                    id=str(a.id),
+                    slug=a.slug,
+                    name=a.name,
+                    is_public=a.is_public,
+                    description=a.description,
+                    app_url=a.app_url,
+                    roles=a.roles,
+                    created_at=a.created_at,
+                )
+                for a in apps
+            ],
+            total=len(apps),
+        )
     )
 
 
@@ -365,11 +446,7 @@ async def list_apps(admin: AdminUser, db: DbSession) -> AppList:
     description="Register a new app. Admin only.",
 )
 async def create_app(request: AppCreate, admin: AdminUser, db: DbSession) -> AppRead:
-    stmt = select(App).where(App.slug == request.slug)
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
-
-    if existing:
+    if await db.scalar(select(exists().where(App.slug == request.slug))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"App with slug '{request.slug}' already exists",
@@ -385,7 +462,8 @@ async def create_app(request: AppCreate, admin: AdminUser, db: DbSession) -> App
     )
     db.add(app)
     await db.flush()
-    await db.refresh(app)
+    # Until now the slug fell under DEFAULT_APP_ACCESS
+    after_commit(db, clear_access_decisions)
 
     return AppRead(
         id=str(app.id),
@@ -401,55 +479,42 @@ async def create_app(request: AppCreate, admin: AdminUser, db: DbSession) -> App
 
 @router.get(
     "/apps/{slug}",
-    response_model=AppDetail,
+    response_model=None,
     responses={
-        200: {"description": "App details with users"},
+        200: {"model": AppDetail, "description": "App details with users"},
         404: {"model": ErrorResponse, "description": "App not found"},
     },
     summary="Get app details",
     description="Get app details including users with access. Admin only.",
 )
-async def get_app(slug: str, admin: AdminUser, db: DbSession) -> AppDetail:
-    stmt = select(App).where(App.slug == slug)
-    result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
+async def get_app(admin: AdminUser, app: AppBySlug, db: DbSession) -> Response:
     # Get users with access
     access_stmt = (
-        select(UserAppAccess, User)
-        .join(User, UserAppAccess.user_id == User.id)
+        select(
+            User.email,
+            UserAppAccess.role,
+            UserAppAccess.granted_at,
+            UserAppAccess.granted_by,
+        )
+        .join(UserAppAccess, UserAppAccess.user_id == User.id)
         .where(UserAppAccess.app_id == app.id)
         .order_by(UserAppAccess.granted_at.desc())
     )
     access_result = await db.execute(access_stmt)
-    access_rows = access_result.all()
-
-    users = [
-        AppUserAccess(
-            email=user.email,
-            role=access.role,
-            granted_at=access.granted_at,
-            granted_by=access.granted_by,
+    users = [AppUserAccess.model_construct(**row) for row in access_result.mappings()]
+
+    return _json_response(
+        AppDetail.model_construct(
+            id=str(app.id),
+            slug=app.slug,
+            name=app.name,
+            is_public=app.is_public,
+            description=app.description,
+            app_url=app.app_url,
+            roles=app.roles,
+            created_at=app.created_at,
+            users=users,
         )
-        for access, user in access_rows
-    ]
-
-    return AppDetail(
-        id=str(app.id),
-        slug=app.slug,
-        name=app.name,
-        is_public=app.is_public,
-        description=app.description,
-        app_url=app.app_url,
-        roles=app.roles,
-        created_at=app.created_at,
-        users=users,
     )
 
 
@@ -463,21 +528,12 @@ async def get_app(slug: str, admin: AdminUser, db: DbSession) -> AppDetail:
     summary="Delete app",
     description="Delete an app and all associated access grants. Admin only.",
 )
-async def delete_app(slug: str, admin: AdminUser, db: DbSession) -> MessageResponse:
-    stmt = select(App).where(App.slug == slug)
-    result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
+async def delete_app(admin: AdminUser, app: AppBySlug, db: DbSession) -> MessageResponse:
     await db.delete(app)
-    await db.flush()
+    after_commit(db, clear_access_request_lists)
+    after_commit(db, clear_access_decisions)
 
-    return MessageResponse(message=f"App '{slug}' deleted successfully")
+    return MessageResponse(message=f"App '{app.slug}' deleted successfully")
 
 
 @router.patch(
@@ -490,19 +546,12 @@ async def delete_app(slug: str, admin: AdminUser, db: DbSession) -> MessageRespo
     summary="Update app",
     description="Update an app's details. Admin only.",
 )
-async def update_app(slug: str, request: AppUpdate, admin: AdminUser, db: DbSession) -> AppRead:
-    stmt = select(App).where(App.slug == slug)
-    result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
+async def update_app(
+    request: AppUpdate, admin: AdminUser, app: AppBySlug, db: DbSession
+) -> AppRead:
     if request.name is not None:
         app.name = request.name
+        after_commit(db, clear_access_request_lists)
     if request.is_public is not None:
         app.is_public = request.is_public
     if request.description is not None:
@@ -511,9 +560,7 @@ async def update_app(slug: str, request: AppUpdate, admin: AdminUser, db: DbSess
         app.app_url = request.app_url
     if request.roles is not None:
         app.roles = request.roles
-
-    await db.flush()
-    await db.refresh(app)
+    after_commit(db, clear_access_decisions)
 
     return AppRead(
         id=str(app.id),
@@ -537,35 +584,67 @@ async def update_app(slug: str, request: AppUpdate, admin: AdminUser, db: DbSess
     summary="List app users",
     description="List all users with access to an app. Admin only.",
 )
-async def list_app_users(slug: str, admin: AdminUser, db: DbSession) -> list[AppUserAccess]:
-    stmt = select(App).where(App.slug == slug)
+async def list_app_users(admin: AdminUser, app: AppBySlug, db: DbSession) -> list[AppUserAccess]:
+    access_stmt = (
+        select(
+            User.email,
+            UserAppAccess.role,
+            UserAppAccess.granted_at,
+            UserAppAccess.granted_by,
+        )
+        .join(UserAppAccess, UserAppAccess.user_id == User.id)
+        .where(UserAppAccess.app_id == app.id)
+        .order_by(UserAppAccess.granted_at.desc())
+    )
+    access_result = await db.execute(access_stmt)
+    return [AppUserAccess.model_construct(**row) for row in access_result.mappings()]
+
+
+async def _get_app_user_access(
+    db: DbSession, slug: str, email: str
+) -> tuple[App, User, UserAppAccess | None]:
+    """Load an app, a user and the user's access to it in one query.
+
+    Raises 404 if the app or user doesn't exist.
+    """
+    stmt = (
+        select(App, User, UserAppAccess)
+        .select_from(App)
+        .outerjoin(User, User.email == email.lower())
+        .outerjoin(
+            UserAppAccess,
+            (UserAppAccess.app_id == App.id) & (UserAppAccess.user_id == User.id),
+        )
+        .where(App.slug == slug)
+    )
     result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
+    row = result.first()
 
-    if not app:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"App '{slug}' not found",
         )
+    if row.User is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User '{email}' not found",
+        )
+    return row.App, row.User, row.UserAppAccess
 
-    access_stmt = (
-        select(UserAppAccess, User)
-        .join(User, UserAppAccess.user_id == User.id)
-        .where(UserAppAccess.app_id == app.id)
-        .order_by(UserAppAccess.granted_at.desc())
+
+async def _upsert_app_access(
+    db: DbSession, user_id: uuid.UUID, app_id: uuid.UUID, role: str | None, granted_by: str
+) -> None:
+    """Insert a user's access to an app, or overwrite its role if it already exists."""
+    stmt = dialect_insert(db)(UserAppAccess).values(
+        user_id=user_id, app_id=app_id, role=role, granted_by=granted_by
     )
-    access_result = await db.execute(access_stmt)
-    access_rows = access_result.all()
-
-    return [
-        AppUserAccess(
-            email=user.email,
-            role=access.role,
-            granted_at=access.granted_at,
-            granted_by=access.granted_by,
-        )
-        for access, user in access_rows
-    ]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserAppAccess.user_id, UserAppAccess.app_id],
+        set_={"role": stmt.excluded.role, "granted_by": stmt.excluded.granted_by},
+    )
+    await db.execute(stmt)
 
 
 @router.post(
@@ -580,69 +659,39 @@ async def list_app_users(slug: str, admin: AdminUser, db: DbSession) -> list[App
     description="Grant a user access to an app with optional role. Admin only.",
 )
 async def grant_app_access(
-    slug: str, request: GrantAccess, admin: AdminUser, db: DbSession
+    slug: str,
+    request: GrantAccess,
+    admin: AdminUser,
+    db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
 ) -> MessageResponse:
-    # Find app
-    app_stmt = select(App).where(App.slug == slug)
-    app_result = await db.execute(app_stmt)
-    app = app_result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
-    # Find user
-    user_stmt = select(User).where(User.email == request.email.lower())
-    user_result = await db.execute(user_stmt)
-    user = user_result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User '{request.email}' not found",
-        )
+    app, user, existing = await _get_app_user_access(db, slug, request.email)
 
-    # Check existing access
-    access_stmt = select(UserAppAccess).where(
-        UserAppAccess.user_id == user.id,
-        UserAppAccess.app_id == app.id,
-    )
-    access_result = await db.execute(access_stmt)
-    existing = access_result.scalar_one_or_none()
-
-    if existing:
-        # Update role if different
-        if existing.role != request.role:
-            existing.role = request.role
-            existing.granted_by = admin.email
-            await db.flush()
-            return MessageResponse(message=f"Updated role for '{request.email}' on '{slug}'")
+    if existing and existing.role == request.role:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User '{request.email}' already has access to '{slug}'",
         )
 
-    # Grant access
-    access = UserAppAccess(
-        user_id=user.id,
-        app_id=app.id,
-        role=request.role,
-        granted_by=admin.email,
-    )
-    db.add(access)
-    await db.flush()
+    # One statement covers both the new grant and the role update, and a
+    # concurrent grant of the same pair becomes an update instead of a PK error
+    await _upsert_app_access(db, user.id, app.id, request.role, admin.email)
+    after_commit(db, clear_access_decisions)
 
-    # Send email notification
-    email_service = EmailService(db=db)
-    await email_service.send_app_access_granted(
-        to_email=user.email,
-        app_name=app.name,
-        app_description=app.description,
-        app_url=app.app_url,
-        granted_by=admin.email,
-    )
+    if existing:
+        return MessageResponse(message=f"Updated role for '{request.email}' on '{slug}'")
+
+    # Send email notification once the response is out
+    if mailer := await email_service.for_background(user.email):
+        background.add_task(
+            mailer.send_app_access_granted,
+            to_email=user.email,
+            app_name=app.name,
+            app_description=app.description,
+            app_url=app.app_url,
+            granted_by=admin.email,
+        )
 
     role_msg = f" with role '{request.role}'" if request.role else ""
     return MessageResponse(message=f"Granted access to '{slug}' for '{request.email}'{role_msg}")
@@ -660,41 +709,12 @@ async def grant_app_access(
 )
 async def revoke_app_access(
     slug: str,
+    admin: AdminUser,
+    db: DbSession,
     email: str = Query(..., description="Email of user to revoke access"),
-    admin: AdminUser = None,
-    db: DbSession = None,
 ) -> MessageResponse:
     email = email.lower()
-
-    # Find app
-    app_stmt = select(App).where(App.slug == slug)
-    app_result = await db.execute(app_stmt)
-    app = app_result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
-    # Find user
-    user_stmt = select(User).where(User.email == email)
-    user_result = await db.execute(user_stmt)
-    user = user_result.scalar_one_or_none()
-
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"User '{email}' not found",
-        )
-
-    # Find and delete access
-    access_stmt = select(UserAppAccess).where(
-        UserAppAccess.user_id == user.id,
-        UserAppAccess.app_id == app.id,
-    )
-    access_result = await db.execute(access_stmt)
-    access = access_result.scalar_one_or_none()
+    _, _, access = await _get_app_user_access(db, slug, email)
 
     if not access:
         raise HTTPException(
@@ -703,7 +723,7 @@ async def revoke_app_access(
         )
 
     await db.delete(access)
-    await db.flush()
+    after_commit(db, clear_access_decisions)
 
     return MessageResponse(message=f"Revoked access to '{slug}' for '{email}'")
 
@@ -715,9 +735,9 @@ async def revoke_app_access(
 
 @router.get(
     "/apps/{slug}/requests",
-    response_model=list[AccessRequestRead],
+    response_model=None,
     responses={
-        200: {"description": "Pending access requests"},
+        200: {"model": list[AccessRequestRead], "description": "Pending access requests"},
         404: {"model": ErrorResponse, "description": "App not found"},
     },
     summary="List pending access requests",
@@ -728,17 +748,12 @@ async def list_access_requests(
     admin: AdminUser,
     db: DbSession,
     status_filter: AccessRequestStatus | None = Query(None, description="Filter by status"),
-) -> list[AccessRequestRead]:
-    # Find app
-    app_stmt = select(App).where(App.slug == slug)
-    app_result = await db.execute(app_stmt)
-    app = app_result.scalar_one_or_none()
+) -> Response:
+    cache_key = (slug, status_filter)
+    if (cached := get_access_request_list(cache_key)) is not None:
+        return Response(content=cached, media_type="application/json")
 
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
+    app = await get_app_by_slug(slug, db)
 
     # Get requests
     requests_stmt = (
@@ -757,8 +772,9 @@ async def list_access_requests(
     result = await db.execute(requests_stmt)
     rows = result.all()
 
-    return [
-        AccessRequestRead(
+    # Rows come straight from the database, so build the models without re-validating
+    access_requests = [
+        AccessRequestRead.model_construct(
             id=str(req.id),
             user_email=user.email,
             user_name=user.name,
@@ -772,6 +788,68 @@ async def list_access_requests(
         )
         for req, user in rows
     ]
+    return _access_request_response(cache_key, access_requests)
+
+
+async def _review_access_request(
+    db: DbSession,
+    slug: str,
+    request_id: uuid.UUID,
+    new_status: AccessRequestStatus,
+    reviewer: str,
+) -> tuple[uuid.UUID, uuid.UUID, str]:
+    """Move a pending access request to `new_status` in a single UPDATE ... RETURNING.
+
+    Returns the request's app id, user id and the requester's email. Raises 404
+    if the app or request doesn't exist and 400 if it was already reviewed.
+    """
+    stmt = (
+        update(AppAccessRequest)
+        .where(
+            AppAccessRequest.id == request_id,
+            AppAccessRequest.app_id == select(App.id).where(App.slug == slug).scalar_subquery(),
+            AppAccessRequest.status == AccessRequestStatus.PENDING,
+        )
+        .values(status=new_status, reviewed_by=reviewer, reviewed_at=func.now())
+        .returning(
+            AppAccessRequest.app_id,
+            AppAccessRequest.user_id,
+            select(User.email).where(User.id == AppAccessRequest.user_id).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    row = result.first()
+    if row is not None:
+        after_commit(db, clear_access_request_lists)
+        return row.app_id, row.user_id, row[2]
+
+    # Nothing matched; find out why
+    diagnose_stmt = (
+        select(App.id, AppAccessRequest.status)
+        .select_from(App)
+        .outerjoin(
+            AppAccessRequest,
+            (AppAccessRequest.app_id == App.id) & (AppAccessRequest.id == request_id),
+        )
+        .where(App.slug == slug)
+    )
+    found = (await db.execute(diagnose_stmt)).first()
+
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"App '{slug}' not found",
+        )
+    if found.status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Access request not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Request is already {found.status.value}",
+    )
 
 
 @router.post(
@@ -792,61 +870,24 @@ async def approve_access_request(
     db: DbSession,
     data: AccessRequestReview | None = None,
 ) -> MessageResponse:
-    # Find app
-    app_stmt = select(App).where(App.slug == slug)
-    app_result = await db.execute(app_stmt)
-    app = app_result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
-    # Find request
-    req_stmt = (
-        select(AppAccessRequest, User)
-        .join(User, AppAccessRequest.user_id == User.id)
-        .where(
-            AppAccessRequest.id == request_id,
-            AppAccessRequest.app_id == app.id,
-        )
+    app_id, user_id, user_email = await _review_access_request(
+        db, slug, request_id, AccessRequestStatus.APPROVED, admin.email
     )
-    req_result = await db.execute(req_stmt)
-    row = req_result.one_or_none()
-
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Access request not found",
-        )
-
-    access_request, user = row
-
-    if access_request.status != AccessRequestStatus.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Request is already {access_request.status.value}",
-        )
 
-    # Update request status
-    access_request.status = AccessRequestStatus.APPROVED
-    access_request.reviewed_by = admin.email
-    access_request.reviewed_at = datetime.now(UTC)
-
-    # Grant access
+    # Grant access in the same transaction, straight from the returned ids
     role = data.role if data else None
-    access = UserAppAccess(
-        user_id=user.id,
-        app_id=app.id,
-        role=role,
-        granted_by=admin.email,
+    await db.execute(
+        insert(UserAppAccess).values(
+            user_id=user_id,
+            app_id=app_id,
+            role=role,
+            granted_by=admin.email,
+        )
     )
-    db.add(access)
-    await db.flush()
+    after_commit(db, clear_access_decisions)
 
     role_msg = f" with role '{role}'" if role else ""
-    return MessageResponse(message=f"Approved access to '{slug}' for '{user.email}'{role_msg}")
+    return MessageResponse(message=f"Approved access to '{slug}' for '{user_email}'{role_msg}")
 
 
 @router.post(
@@ -866,88 +907,59 @@ async def reject_access_request(
     admin: AdminUser,
     db: DbSession,
 ) -> MessageResponse:
-    # Find app
-    app_stmt = select(App).where(App.slug == slug)
-    app_result = await db.execute(app_stmt)
-    app = app_result.scalar_one_or_none()
-
-    if not app:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"App '{slug}' not found",
-        )
-
-    # Find request
-    req_stmt = (
-        select(AppAccessRequest, User)
-        .join(User, AppAccessRequest.user_id == User.id)
-        .where(
-            AppAccessRequest.id == request_id,
-            AppAccessRequest.app_id == app.id,
-        )
+    _, _, user_email = await _review_access_request(
+        db, slug, request_id, AccessRequestStatus.REJECTED, admin.email
     )
-    req_result = await db.execute(req_stmt)
-    row = req_result.one_or_none()
 
-    if not row:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Access request not found",
-        )
-
-    access_request, user = row
-
-    if access_request.status != AccessRequestStatus.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Request is already {access_request.status.value}",
-        )
-
-    # Update request status
-    access_request.status = AccessRequestStatus.REJECTED
-    access_request.reviewed_by = admin.email
-    access_request.reviewed_at = datetime.now(UTC)
-    await db.flush()
-
-    return MessageResponse(message=f"Rejected access request from '{user.email}' for '{slug}'")
+    return MessageResponse(message=f"Rejected access request from '{user_email}' for '{slug}'")
 
 
 @router.get(
     "/requests",
-    response_model=list[AccessRequestRead],
+    response_model=None,
+    responses={200: {"model": list[AccessRequestRead]}},
     summary="List all pending access requests",
     description="List all pending access requests across all apps. Admin only.",
 )
 async def list_all_access_requests(
     admin: AdminUser,
     db: DbSession,
-) -> list[AccessRequestRead]:
+) -> Response:
     """Get all pending access requests across all apps, sorted by created_at ascending."""
+    if (cached := get_access_request_list((None, None))) is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Requests cluster on a handful of apps, so load each app once by id
+    # instead of repeating its columns on every joined row
     requests_stmt = (
-        select(AppAccessRequest, User, App)
+        select(AppAccessRequest, User)
         .join(User, AppAccessRequest.user_id == User.id)
-        .join(App, AppAccessRequest.app_id == App.id)
+        .options(selectinload(AppAccessRequest.app))
         .where(AppAccessRequest.status == AccessRequestStatus.PENDING)
         .order_by(AppAccessRequest.created_at.asc())
     )
-    result = await db.execute(requests_stmt)
-    rows = result.all()
 
-    return [
-        AccessRequestRead(
-            id=str(req.id),
-            user_email=user.email,
-            user_name=user.name,
-            app_slug=app.slug,
-            app_name=app.name,
-            message=req.message,
-            status=req.status,
-            reviewed_by=req.reviewed_by,
-            reviewed_at=req.reviewed_at,
-            created_at=req.created_at,
+    # Rows are fetched from the server-side cursor 500 at a time, and the loop gets a
+    # turn between batches; the response itself is still one JSON array
+    access_requests: list[AccessRequestRead] = []
+    result = await db.stream(requests_stmt)
+    async for partition in result.partitions(500):
+        access_requests.extend(
+            AccessRequestRead.model_construct(
+                id=str(req.id),
+                user_email=user.email,
+                user_name=user.name,
+                app_slug=req.app.slug,
+                app_name=req.app.name,
+                message=req.message,
+                status=req.status,
+                reviewed_by=req.reviewed_by,
+                reviewed_at=req.reviewed_at,
+                created_at=req.created_at,
+            )
+            for req, user in partition
         )
-        for req, user, app in rows
-    ]
+    return _access_request_response((None, None), access_requests)
 
 
 @router.post(
@@ -961,25 +973,33 @@ async def list_all_access_requests(
     description="Grant multiple users access to multiple apps at once. Admin only.",
 )
 async def bulk_grant_access(
-    request: BulkGrantAccess, admin: AdminUser, db: DbSession
+    request: BulkGrantAccess,
+    admin: AdminUser,
+    db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
 ) -> MessageResponse:
+    # Emails are stored lowercased, so lowercase the request once and match directly
+    emails = [e.lower() for e in request.emails]
+
     # Find all users
-    users_stmt = select(User).where(User.email.in_([e.lower() for e in request.emails]))
+    users_stmt = select(User).where(User.email.in_(emails))
     users_result = await db.execute(users_stmt)
     users = {u.email: u for u in users_result.scalars().all()}
+    # Find all apps
+    apps_stmt = select(App).where(App.slug.in_(request.app_slugs))
+    apps_result = await db.execute(apps_stmt)
+    apps = {a.slug: a for a in apps_result.scalars().all()}
 
-    missing_users = [e for e in request.emails if e.lower() not in users]
+    missing_users = [
+        e for e, lowered in zip(request.emails, emails, strict=True) if lowered not in users
+    ]
     if missing_users:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Users not found: {', '.join(missing_users)}",
         )
 
-    # Find all apps
-    apps_stmt = select(App).where(App.slug.in_(request.app_slugs))
-    apps_result = await db.execute(apps_stmt)
-    apps = {a.slug: a for a in apps_result.scalars().all()}
-
     missing_apps = [s for s in request.app_slugs if s not in apps]
     if missing_apps:
         raise HTTPException(
@@ -987,43 +1007,52 @@ async def bulk_grant_access(
             detail=f"Apps not found: {', '.join(missing_apps)}",
         )
 
-    # Grant access to each user-app pair
-    grants_created = 0
-    email_service = EmailService(db=db)
-
-    for email in request.emails:
-        user = users[email.lower()]
-        for app_slug in request.app_slugs:
-            app = apps[app_slug]
-
-            # Check if access already exists
-            access_stmt = select(UserAppAccess).where(
-                UserAppAccess.user_id == user.id,
-                UserAppAccess.app_id == app.id,
-            )
-            access_result = await db.execute(access_stmt)
-            existing = access_result.scalar_one_or_none()
-
-            if not existing:
-                access = UserAppAccess(
-                    user_id=user.id,
-                    app_id=app.id,
-                    role=request.role,
-                    granted_by=admin.email,
-                )
-                db.add(access)
-                grants_created += 1
-
-                # Send email notification
-                await email_service.send_app_access_granted(
+    # Insert every requested pair and let the primary key skip the ones that already
+    # exist; RETURNING reports exactly which grants are new. Batched so a large
+    # users x apps product doesn't build one huge parameter set.
+    users_by_id = {u.id: u for u in users.values()}
+    apps_by_id = {a.id: a for a in apps.values()}
+    stmt = (
+        dialect_insert(db)(UserAppAccess)
+        .on_conflict_do_nothing(index_elements=[UserAppAccess.user_id, UserAppAccess.app_id])
+        .returning(UserAppAccess.user_id, UserAppAccess.app_id)
+    )
+    rows = [
+        {"user_id": user_id, "app_id": app_id, "role": request.role, "granted_by": admin.email}
+        for user_id in users_by_id
+        for app_id in apps_by_id
+    ]
+    new_grants: list[tuple[User, App]] = []
+    batch_size = max(1, get_settings().bulk_grant_batch_size)
+    for start in range(0, len(rows), batch_size):
+        result = await db.execute(stmt, rows[start : start + batch_size])
+        new_grants.extend(
+            (users_by_id[user_id], apps_by_id[app_id]) for user_id, app_id in result.tuples()
+        )
+    grants_created = len(new_grants)
+    if grants_created:
+        after_commit(db, clear_access_decisions)
+
+    # Send email notifications once the response is out, concurrently rather than one by one
+    await email_service.preload_suppressions(user.email for user, _ in new_grants)
+    mailers: dict[str, EmailService | None] = {}
+    sends = []
+    for user, app in new_grants:
+        if user.email not in mailers:
+            mailers[user.email] = await email_service.for_background(user.email)
+        if mailer := mailers[user.email]:
+            sends.append(
+                partial(
+                    mailer.send_app_access_granted,
                     to_email=user.email,
                     app_name=app.name,
                     app_description=app.description,
                     app_url=app.app_url,
                     granted_by=admin.email,
                 )
-
-    await db.flush()
+            )
+    if sends:
+        background.add_task(send_concurrently, sends)
 
     return MessageResponse(
         message=f"Created {grants_created} access grant(s) for {len(request.emails)} user(s) "
@@ -1,13 +1,32 @@
-import base64
-import json
 import uuid
-from typing import Any
-
-from fastapi import APIRouter, Header, HTTPException, Path, Request, Response, status
-from sqlalchemy import select
-
-from gatekeeper.api.deps import CurrentUser, CurrentUserOptional, DbSession
+from functools import partial
+from typing import Annotated, Any, Final
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Cookie,
+    Header,
+    HTTPException,
+    Path,
+    Request,
+    Response,
+    status,
+)
+from pydantic import TypeAdapter
+from sqlalchemy import Row, exists, literal, select
+
+from gatekeeper.api.deps import (
+    CurrentUser,
+    DbSession,
+    EmailServiceDep,
+    OTPServiceDep,
+    PasskeyServiceDep,
+    SessionServiceDep,
+    get_user_by_email,
+)
 from gatekeeper.config import get_settings
+from gatekeeper.database import after_commit
 from gatekeeper.models.app import AccessRequestStatus, App, AppAccessRequest, UserAppAccess
 from gatekeeper.models.otp import OTPPurpose
 from gatekeeper.models.user import User, UserStatus
@@ -26,18 +45,45 @@ from gatekeeper.schemas.auth import (
     UserAppAccessInfo,
     UserResponse,
 )
-from gatekeeper.services.email import EmailService
-from gatekeeper.services.otp import OTPService
-from gatekeeper.services.passkey import PasskeyService
-from gatekeeper.services.session import SessionService
-from gatekeeper.utils.security import create_signed_token
+from gatekeeper.services.admin_cache import (
+    clear_access_request_lists,
+    clear_admin_emails,
+    get_admin_emails,
+)
+from gatekeeper.services.authz import validate_fast
+from gatekeeper.services.email import send_concurrently
+from gatekeeper.services.passkey import client_data_challenge
+from gatekeeper.services.session import (
+    access_decisions_generation,
+    cache_access_decision,
+    clear_access_decisions,
+    get_access_decision,
+)
+from gatekeeper.utils.security import create_signed_token, verify_signed_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 settings = get_settings()
 
-COOKIE_NAME = "session"
-COOKIE_MAX_AGE = settings.session_expiry_days * 24 * 60 * 60
+COOKIE_NAME: Final = "session"
+COOKIE_MAX_AGE: Final[int] = settings.session_expiry_days * 24 * 60 * 60
+# Fixed for the life of the process, so work them out once rather than per sign-in
+_COOKIE_SECURE: Final[bool] = settings.app_url.startswith("https")
+_COOKIE_DOMAIN: Final[str | None] = settings.cookie_domain
+
+
+# The App columns the discovery endpoints return, selected directly rather than loading
+# rows and named after the AppPublic / UserAppAccessInfo fields they fill
+_APP_PUBLIC_COLUMNS = (App.slug, App.name, App.description, App.app_url)
+_MY_APP_COLUMNS = (
+    App.slug.label("app_slug"),
+    App.name.label("app_name"),
+    App.description.label("app_description"),
+    App.app_url,
+)
+
+# Core schema built once here; /auth/me is polled by clients
+_user_response_adapter = TypeAdapter(UserResponse)
 
 
 def set_session_cookie(response: Response, token: str) -> None:
@@ -48,14 +94,14 @@ def set_session_cookie(response: Response, token: str) -> None:
         max_age=COOKIE_MAX_AGE,
         httponly=True,
         samesite="lax",
-        secure=settings.app_url.startswith("https"),
-        domain=settings.cookie_domain,
+        secure=_COOKIE_SECURE,
+        domain=_COOKIE_DOMAIN,
         path="/",
     )
 
 
 def clear_session_cookie(response: Response) -> None:
-    response.delete_cookie(key=COOKIE_NAME, domain=settings.cookie_domain, path="/")
+    response.delete_cookie(key=COOKIE_NAME, domain=_COOKIE_DOMAIN, path="/")
 
 
 @router.get(
@@ -70,10 +116,9 @@ def clear_session_cookie(response: Response) -> None:
     "Used by nginx auth_request directive.",
 )
 async def validate(
-    response: Response,
     db: DbSession,
-    current_user: CurrentUserOptional,
     x_gk_app: str | None = Header(None, alias="X-GK-App"),
+    session: Annotated[str | None, Cookie()] = None,
 ) -> Response:
     """
     Validate endpoint for nginx auth_request.
@@ -83,59 +128,59 @@ async def validate(
     - If app not registered: follows DEFAULT_APP_ACCESS setting
     - If app registered: checks user_app_access table
     """
-    # Check authentication
-    if not current_user:
+    token = verify_signed_token(session) if session else None
+    if not token:
         return Response(status_code=status.HTTP_401_UNAUTHORIZED)
 
+    # nginx repeats this for every proxied request; answer repeats from the cache
+    if (decision := get_access_decision(token, x_gk_app)) is None:
+        generation = access_decisions_generation()
+        # Session, user and app access in a single round trip
+        row = await validate_fast(db, token, x_gk_app)
+        if not row or row.status != UserStatus.APPROVED:
+            return Response(status_code=status.HTTP_401_UNAUTHORIZED)
+        decision = _access_decision(row, x_gk_app)
+        cache_access_decision(token, x_gk_app, decision, row.expires_at, generation)
+
+    status_code, headers = decision
+    return Response(status_code=status_code, headers=headers)
+
+
+def _access_decision(row: Row, x_gk_app: str | None) -> tuple[int, dict[str, str]]:
+    """Decide an authenticated user's access to an app, as (status code, headers)."""
     # Build base headers for all authenticated requests
-    base_headers = {"X-Auth-User": current_user.email}
-    if current_user.name:
-        base_headers["X-Auth-Name"] = current_user.name
+    base_headers = {"X-Auth-User": row.email}
+    if row.name:
+        base_headers["X-Auth-Name"] = row.name
 
     # No app specified - pure identity check
     if not x_gk_app:
-        return Response(status_code=status.HTTP_200_OK, headers=base_headers)
+        return status.HTTP_200_OK, base_headers
 
     # Super admins have access to all apps
-    if current_user.is_admin:
-        return Response(
-            status_code=status.HTTP_200_OK,
-            headers={**base_headers, "X-Auth-Role": "admin"},
-        )
-
-    # Look up the app
-    stmt = select(App).where(App.slug == x_gk_app)
-    result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
+    if row.is_admin:
+        return status.HTTP_200_OK, {**base_headers, "X-Auth-Role": "admin"}
 
     # App not registered - follow default policy
-    if not app:
+    if row.app_id is None:
         if settings.default_app_access == "deny":
-            return Response(status_code=status.HTTP_403_FORBIDDEN)
+            return status.HTTP_403_FORBIDDEN, {}
         # default_app_access == "allow"
-        return Response(status_code=status.HTTP_200_OK, headers=base_headers)
-
-    # Check if user has explicit access (with role)
-    access_stmt = select(UserAppAccess).where(
-        UserAppAccess.user_id == current_user.id,
-        UserAppAccess.app_id == app.id,
-    )
-    access_result = await db.execute(access_stmt)
-    access = access_result.scalar_one_or_none()
+        return status.HTTP_200_OK, base_headers
 
-    if access:
+    if row.access_user_id is not None:
         # User has explicit access - return headers with role if set
         headers = {**base_headers}
-        if access.role:
-            headers["X-Auth-Role"] = access.role
-        return Response(status_code=status.HTTP_200_OK, headers=headers)
+        if row.role:
+            headers["X-Auth-Role"] = row.role
+        return status.HTTP_200_OK, headers
 
     # No explicit access - public apps are accessible to all approved users
-    if app.is_public:
-        return Response(status_code=status.HTTP_200_OK, headers=base_headers)
+    if row.is_public:
+        return status.HTTP_200_OK, base_headers
 
     # Private app without access - deny
-    return Response(status_code=status.HTTP_403_FORBIDDEN)
+    return status.HTTP_403_FORBIDDEN, {}
 
 
 @router.post(
@@ -150,13 +195,15 @@ async def validate(
     description="Send an OTP to the provided email address to start registration.",
 )
 @limiter.limit("3/hour")
-async def register(request: Request, data: OTPRequest, db: DbSession) -> MessageResponse:
-    email = data.email.lower()
-
-    stmt = select(User).where(User.email == email)
-    result = await db.execute(stmt)
-    existing_user = result.scalar_one_or_none()
+async def register(
+    request: Request,
+    data: OTPRequest,
+    db: DbSession,
+    otp_service: OTPServiceDep,
+) -> MessageResponse:
+    email = data.email
 
+    existing_user = await get_user_by_email(db, email)
     if existing_user:
         if existing_user.status == UserStatus.APPROVED:
             raise HTTPException(
@@ -174,7 +221,6 @@ async def register(request: Request, data: OTPRequest, db: DbSession) -> Message
                 detail="Registration was rejected. Please contact an administrator.",
             )
 
-    otp_service = OTPService(db)
     sent = await otp_service.create_and_send(email, OTPPurpose.REGISTER)
 
     if not sent:
@@ -207,21 +253,22 @@ async def register_verify(
     data: OTPVerifyRequest,
     response: Response,
     db: DbSession,
+    otp_service: OTPServiceDep,
+    session_service: SessionServiceDep,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
 ) -> AuthResponse:
-    email = data.email.lower()
+    email = data.email
 
-    otp_service = OTPService(db)
-    success, error_message = await otp_service.verify(email, data.code, OTPPurpose.REGISTER)
+    success, error_message, existing_user = await otp_service.verify(
+        email, data.code, OTPPurpose.REGISTER
+    )
     if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_message or "Invalid or expired verification code.",
         )
 
-    stmt = select(User).where(User.email == email)
-    result = await db.execute(stmt)
-    existing_user = result.scalar_one_or_none()
-
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -237,31 +284,37 @@ async def register_verify(
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
 
     if auto_approve:
-        session_service = SessionService(db)
         session = await session_service.create(user)
         await db.commit()  # Commit before responding so /auth/me can find the session
         set_session_cookie(response, session.token)
 
         return AuthResponse(
             message="Registration successful",
-            user=UserResponse.model_validate(user),
+            user=_user_response_adapter.validate_python(user),
         )
     else:
-        email_service = EmailService(db=db)
-        await email_service.send_registration_pending(email)
+        admin_emails = await get_admin_emails(db)
+        await email_service.preload_suppressions([email, *admin_emails])
+
+        sends = []
+        if mailer := await email_service.for_background(email):
+            sends.append(partial(mailer.send_registration_pending, email))
 
         # Notify all admins of the pending registration
-        admin_stmt = select(User).where(User.is_admin == True)  # noqa: E712
-        admin_result = await db.execute(admin_stmt)
-        admins = admin_result.scalars().all()
-        for admin in admins:
-            await email_service.send_pending_registration_notification(admin.email, email)
+        for admin_email in admin_emails:
+            if mailer := await email_service.for_background(admin_email):
+                sends.append(
+                    partial(mailer.send_pending_registration_notification, admin_email, email)
+                )
 
         await db.commit()  # Commit pending user so they persist
 
+        # Send once the response is out, concurrently rather than one admin at a time
+        if sends:
+            background.add_task(send_concurrently, sends)
+
         return AuthResponse(
             message="Registration pending approval",
             user=None,
@@ -280,13 +333,15 @@ async def register_verify(
     description="Send an OTP to the provided email address to start sign-in.",
 )
 @limiter.limit("5/15minutes")
-async def signin(request: Request, data: OTPRequest, db: DbSession) -> MessageResponse:
-    email = data.email.lower()
-
-    stmt = select(User).where(User.email == email)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+async def signin(
+    request: Request,
+    data: OTPRequest,
+    db: DbSession,
+    otp_service: OTPServiceDep,
+) -> MessageResponse:
+    email = data.email
 
+    user = await get_user_by_email(db, email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -305,7 +360,6 @@ async def signin(request: Request, data: OTPRequest, db: DbSession) -> MessageRe
             detail="Your registration was rejected. Please contact an administrator.",
         )
 
-    otp_service = OTPService(db)
     sent = await otp_service.create_and_send(email, OTPPurpose.SIGNIN)
 
     if not sent:
@@ -337,35 +391,32 @@ async def signin_verify(
     data: OTPVerifyRequest,
     response: Response,
     db: DbSession,
+    otp_service: OTPServiceDep,
+    session_service: SessionServiceDep,
 ) -> AuthResponse:
-    email = data.email.lower()
-
-    stmt = select(User).where(User.email == email, User.status == UserStatus.APPROVED)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    email = data.email
 
-    if not user:
+    # Sign-in codes are only sent to approved accounts, so look the user up with the code
+    success, error_message, user = await otp_service.verify(email, data.code, OTPPurpose.SIGNIN)
+    if not success:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No approved account found with this email.",
+            detail=error_message or "Invalid or expired verification code.",
         )
 
-    otp_service = OTPService(db)
-    success, error_message = await otp_service.verify(email, data.code, OTPPurpose.SIGNIN)
-    if not success:
+    if not user or user.status != UserStatus.APPROVED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=error_message or "Invalid or expired verification code.",
+            detail="No approved account found with this email.",
         )
 
-    session_service = SessionService(db)
     session = await session_service.create(user)
     await db.commit()  # Commit before responding so /auth/me can find the session
     set_session_cookie(response, session.token)
 
     return AuthResponse(
         message="Successfully signed in",
-        user=UserResponse.model_validate(user),
+        user=_user_response_adapter.validate_python(user),
     )
 
 
@@ -378,15 +429,12 @@ async def signin_verify(
 async def signout(
     response: Response,
     current_user: CurrentUser,
-    db: DbSession,
-    session: str | None = None,
+    session_service: SessionServiceDep,
+    session: Annotated[str | None, Cookie()] = None,
 ) -> MessageResponse:
     if session:
-        from gatekeeper.utils.security import verify_signed_token
-
         token = verify_signed_token(session)
         if token:
-            session_service = SessionService(db)
             await session_service.delete(token)
 
     clear_session_cookie(response)
@@ -404,7 +452,7 @@ async def signout(
     description="Get the currently authenticated user's information.",
 )
 async def get_me(current_user: CurrentUser) -> UserResponse:
-    return UserResponse.model_validate(current_user)
+    return _user_response_adapter.validate_python(current_user)
 
 
 @router.patch(
@@ -424,12 +472,15 @@ async def update_me(
 ) -> UserResponse:
     if data.name is not None:
         current_user.name = data.name
+        # The name is part of cached /validate answers and access request lists
+        after_commit(db, clear_access_decisions)
+        after_commit(db, clear_access_request_lists)
     # Only super-admins can toggle notification preferences
     if data.notify_private_app_requests is not None and current_user.is_admin:
         current_user.notify_private_app_requests = data.notify_private_app_requests
+        after_commit(db, clear_admin_emails)
     await db.flush()
-    await db.refresh(current_user)
-    return UserResponse.model_validate(current_user)
+    return _user_response_adapter.validate_python(current_user)
 
 
 @router.get(
@@ -442,14 +493,13 @@ async def update_me(
     description="List all publicly visible apps for discovery.",
 )
 async def list_public_apps(db: DbSession) -> list[AppPublic]:
-    stmt = select(App).where(App.is_public == True).order_by(App.name)  # noqa: E712
+    stmt = (
+        select(*_APP_PUBLIC_COLUMNS).where(App.is_public == True).order_by(App.name)  # noqa: E712
+    )
     result = await db.execute(stmt)
-    apps = result.scalars().all()
-
-    return [
-        AppPublic(slug=app.slug, name=app.name, description=app.description, app_url=app.app_url)
-        for app in apps
-    ]
+    # Validation is skipped on purpose: the SELECT fixes the row shape and the
+    # column names match the schema's fields
+    return [AppPublic.model_construct(**row) for row in result.mappings()]
 
 
 @router.get(
@@ -466,25 +516,18 @@ async def list_private_apps(
     current_user: CurrentUser,
     db: DbSession,
 ) -> list[AppPublic]:
-    # Get IDs of apps user already has access to
-    access_stmt = select(UserAppAccess.app_id).where(UserAppAccess.user_id == current_user.id)
-    access_result = await db.execute(access_stmt)
-    accessible_app_ids = {row[0] for row in access_result.all()}
-
-    # Get private apps the user doesn't have access to
+    # Private apps the user doesn't have access to
+    has_access = exists().where(
+        UserAppAccess.user_id == current_user.id,
+        UserAppAccess.app_id == App.id,
+    )
     stmt = (
-        select(App)
-        .where(App.is_public == False)  # noqa: E712
-        .where(App.id.notin_(accessible_app_ids) if accessible_app_ids else True)
+        select(*_APP_PUBLIC_COLUMNS)
+        .where(App.is_public == False, ~has_access)  # noqa: E712
         .order_by(App.name)
     )
     result = await db.execute(stmt)
-    apps = result.scalars().all()
-
-    return [
-        AppPublic(slug=app.slug, name=app.name, description=app.description, app_url=app.app_url)
-        for app in apps
-    ]
+    return [AppPublic.model_construct(**row) for row in result.mappings()]
 
 
 @router.get(
@@ -501,46 +544,30 @@ async def list_my_apps(
     current_user: CurrentUser,
     db: DbSession,
 ) -> list[UserAppAccessInfo]:
-    # Get apps with explicit access
+    # Apps with explicit access
     stmt = (
-        select(UserAppAccess, App)
+        select(*_MY_APP_COLUMNS, UserAppAccess.role, UserAppAccess.granted_at)
         .join(App, UserAppAccess.app_id == App.id)
         .where(UserAppAccess.user_id == current_user.id)
-        .order_by(App.name)
     )
     result = await db.execute(stmt)
-    rows = result.all()
-
-    # Build result with explicit access apps
-    apps_by_slug: dict[str, UserAppAccessInfo] = {}
-    for access, app in rows:
-        apps_by_slug[app.slug] = UserAppAccessInfo(
-            app_slug=app.slug,
-            app_name=app.name,
-            app_description=app.description,
-            app_url=app.app_url,
-            role=access.role,
-            granted_at=access.granted_at,
-        )
+    apps = [UserAppAccessInfo.model_construct(**row) for row in result.mappings()]
 
-    # Add public apps the user doesn't have explicit access to
-    public_stmt = select(App).where(App.is_public == True).order_by(App.name)  # noqa: E712
+    # Plus public apps the user doesn't have explicit access to
+    has_access = exists().where(
+        UserAppAccess.user_id == current_user.id,
+        UserAppAccess.app_id == App.id,
+    )
+    public_stmt = select(
+        *_MY_APP_COLUMNS,
+        literal("user").label("role"),  # Default role for public apps
+        App.created_at.label("granted_at"),  # Use app creation time
+    ).where(App.is_public == True, ~has_access)  # noqa: E712
     public_result = await db.execute(public_stmt)
-    public_apps = public_result.scalars().all()
-
-    for app in public_apps:
-        if app.slug not in apps_by_slug:
-            apps_by_slug[app.slug] = UserAppAccessInfo(
-                app_slug=app.slug,
-                app_name=app.name,
-                app_description=app.description,
-                app_url=app.app_url,
-                role="user",  # Default role for public apps
-                granted_at=app.created_at,  # Use app creation time
-            )
+    apps.extend(UserAppAccessInfo.model_construct(**row) for row in public_result.mappings())
 
     # Return sorted by app name
-    return sorted(apps_by_slug.values(), key=lambda x: x.app_name.lower())
+    return sorted(apps, key=lambda x: x.app_name.lower())
 
 
 @router.post(
@@ -559,39 +586,40 @@ async def request_app_access(
     slug: str,
     current_user: CurrentUser,
     db: DbSession,
+    email_service: EmailServiceDep,
+    background: BackgroundTasks,
     data: AccessRequestCreate | None = None,
 ) -> MessageResponse:
-    # Find the app
-    stmt = select(App).where(App.slug == slug)
+    # Find the app, and whether the user already has access or a pending request
+    has_access = exists().where(
+        UserAppAccess.user_id == current_user.id,
+        UserAppAccess.app_id == App.id,
+    )
+    has_pending = exists().where(
+        AppAccessRequest.user_id == current_user.id,
+        AppAccessRequest.app_id == App.id,
+        AppAccessRequest.status == AccessRequestStatus.PENDING,
+    )
+    stmt = select(App, has_access.label("has_access"), has_pending.label("has_pending")).where(
+        App.slug == slug
+    )
     result = await db.execute(stmt)
-    app = result.scalar_one_or_none()
+    row = result.first()
 
-    if not app:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="App not found.",
         )
+    app = row.App
 
-    # Check if user already has access
-    access_stmt = select(UserAppAccess).where(
-        UserAppAccess.user_id == current_user.id,
-        UserAppAccess.app_id == app.id,
-    )
-    access_result = await db.execute(access_stmt)
-    if access_result.scalar_one_or_none():
+    if row.has_access:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have access to this app.",
         )
 
-    # Check if there's already a pending request
-    pending_stmt = select(AppAccessRequest).where(
-        AppAccessRequest.user_id == current_user.id,
-        AppAccessRequest.app_id == app.id,
-        AppAccessRequest.status == AccessRequestStatus.PENDING,
-    )
-    pending_result = await db.execute(pending_stmt)
-    if pending_result.scalar_one_or_none():
+    if row.has_pending:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="You already have a pending request for this app.",
@@ -605,34 +633,29 @@ async def request_app_access(
     )
     db.add(access_request)
     await db.flush()
+    after_commit(db, clear_access_request_lists)
 
-    # For private apps, notify opted-in super-admins
-    # Wrap in try/except so notification failures don't affect the request
+    # For private apps, notify opted-in super-admins once the response is out
     if not app.is_public:
-        try:
-            admin_stmt = select(User).where(
-                User.is_admin == True,  # noqa: E712
-                User.notify_private_app_requests == True,  # noqa: E712
-            )
-            admin_result = await db.execute(admin_stmt)
-            admins = admin_result.scalars().all()
-
-            email_service = EmailService(db=db)
-            for admin in admins:
-                await email_service.send_private_app_access_request_notification(
-                    admin_email=admin.email,
-                    requester_email=current_user.email,
-                    requester_name=current_user.name,
-                    app_name=app.name,
-                    message=data.message if data else None,
+        admin_emails = await get_admin_emails(db, notify_only=True)
+        await email_service.preload_suppressions(admin_emails)
+
+        sends = []
+        for admin_email in admin_emails:
+            if mailer := await email_service.for_background(admin_email):
+                sends.append(
+                    partial(
+                        mailer.send_private_app_access_request_notification,
+                        admin_email=admin_email,
+                        requester_email=current_user.email,
+                        requester_name=current_user.name,
+                        app_name=app.name,
+                        message=data.message if data else None,
+                    )
                 )
-        except Exception:
-            # Log but don't fail the request
-            import logging
-
-            logging.getLogger(__name__).exception(
-                "Failed to send private app access request notifications"
-            )
+        # send_concurrently logs failures, so they never affect the request
+        if sends:
+            background.add_task(send_concurrently, sends)
 
     return MessageResponse(
         message="Access request submitted",
@@ -663,27 +686,25 @@ async def delete_me(
 
     await db.delete(current_user)
     await db.flush()
+    after_commit(db, clear_access_request_lists)
+    after_commit(db, clear_access_decisions)
+    if current_user.is_admin:
+        after_commit(db, clear_admin_emails)
     clear_session_cookie(response)
     return MessageResponse(message="Account deleted successfully")
 
 
-_passkey_challenges: dict[str, bytes] = {}
-_passkey_registration_challenges: dict[str, bytes] = {}
-
-
 @router.post(
     "/passkey/register/options",
     response_model=dict[str, Any],
     summary="Get passkey registration options",
     description="Get WebAuthn options for registering a new passkey. Requires authentication.",
 )
-async def passkey_register_options(current_user: CurrentUser, db: DbSession) -> dict[str, Any]:
-    passkey_service = PasskeyService(db)
-    options = await passkey_service.generate_registration_options(current_user)
-    # Store challenge at module level so it persists across requests
-    user_id = str(current_user.id)
-    _passkey_registration_challenges[user_id] = passkey_service._challenges.get(user_id)
-    return options
+async def passkey_register_options(
+    current_user: CurrentUser,
+    passkey_service: PasskeyServiceDep,
+) -> dict[str, Any]:
+    return await passkey_service.generate_registration_options(current_user)
 
 
 @router.post(
@@ -699,18 +720,27 @@ async def passkey_register_options(current_user: CurrentUser, db: DbSession) ->
 async def passkey_register_verify(
     request: PasskeyVerifyRequest,
     current_user: CurrentUser,
-    db: DbSession,
+    passkey_service: PasskeyServiceDep,
 ) -> MessageResponse:
-    # Retrieve challenge from module-level storage
-    challenge = _passkey_registration_challenges.pop(str(current_user.id), None)
+    credential_dict = request.credential.model_dump()
+
+    try:
+        challenge_from_client = client_data_challenge(credential_dict)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid credential format.",
+        ) from None
+
+    challenge = await passkey_service.redeem_registration_challenge(
+        current_user.id, challenge_from_client
+    )
     if not challenge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Challenge expired or invalid. Please try again.",
         )
 
-    passkey_service = PasskeyService(db)
-    credential_dict = request.credential.model_dump()
     passkey_name = request.name or "Passkey"
     passkey = await passkey_service.verify_registration_with_challenge(
         current_user, credential_dict, challenge, name=passkey_name
@@ -741,14 +771,9 @@ async def passkey_register_verify(
 async def passkey_signin_options(
     request: Request,
     data: PasskeyOptionsRequest,
-    db: DbSession,
+    passkey_service: PasskeyServiceDep,
 ) -> dict[str, Any]:
-    passkey_service = PasskeyService(db)
-    options, challenge = await passkey_service.generate_authentication_options(data.email)
-
-    challenge_key = options["challenge"]
-    _passkey_challenges[challenge_key] = challenge
-
+    options, _ = await passkey_service.generate_authentication_options(data.email)
     return options
 
 
@@ -766,27 +791,26 @@ async def passkey_signin_verify(
     request: PasskeyVerifyRequest,
     response: Response,
     db: DbSession,
+    session_service: SessionServiceDep,
+    passkey_service: PasskeyServiceDep,
 ) -> AuthResponse:
     credential_dict = request.credential.model_dump()
-    client_data = credential_dict.get("response", {}).get("clientDataJSON", "")
 
     try:
-        client_data_json = json.loads(base64.urlsafe_b64decode(client_data + "=="))
-        challenge_from_client = client_data_json.get("challenge", "")
+        challenge_from_client = client_data_challenge(credential_dict)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid credential format.",
         ) from None
 
-    challenge = _passkey_challenges.pop(challenge_from_client, None)
+    challenge = await passkey_service.redeem_authentication_challenge(challenge_from_client)
     if not challenge:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Challenge expired or invalid. Please try again.",
         )
 
-    passkey_service = PasskeyService(db)
     user = await passkey_service.verify_authentication(credential_dict, challenge)
 
     if not user:
@@ -801,14 +825,13 @@ async def passkey_signin_verify(
             detail="Account not approved.",
         )
 
-    session_service = SessionService(db)
     session = await session_service.create(user)
     await db.commit()  # Commit before responding so /auth/me can find the session
     set_session_cookie(response, session.token)
 
     return AuthResponse(
         message="Successfully signed in",
-        user=UserResponse.model_validate(user),
+        user=_user_response_adapter.validate_python(user),
     )
 
 
@@ -818,8 +841,10 @@ async def passkey_signin_verify(
     summary="List passkeys",
     description="List all registered passkeys for the current user.",
 )
-async def list_passkeys(current_user: CurrentUser, db: DbSession) -> list[PasskeyInfo]:
-    passkey_service = PasskeyService(db)
+async def list_passkeys(
+    current_user: CurrentUser,
+    passkey_service: PasskeyServiceDep,
+) -> list[PasskeyInfo]:
     passkeys = await passkey_service.list_passkeys(current_user.id)
     return [PasskeyInfo(**p) for p in passkeys]
 
@@ -835,9 +860,9 @@ async def list_passkeys(current_user: CurrentUser, db: DbSession) -> list[Passke
     description="Delete a registered passkey.",
 )
 async def delete_passkey(
+    current_user: CurrentUser,
+    passkey_service: PasskeyServiceDep,
     passkey_id: str = Path(..., description="UUID of the passkey to delete"),
-    current_user: CurrentUser = None,
-    db: DbSession = None,
 ) -> MessageResponse:
     try:
         pk_uuid = uuid.UUID(passkey_id)
@@ -847,7 +872,6 @@ async def delete_passkey(
             detail="Invalid passkey ID format. Must be a valid UUID.",
         ) from None
 
-    passkey_service = PasskeyService(db)
     deleted = await passkey_service.delete_passkey(pk_uuid, current_user.id)
 
     if not deleted:
@@ -1,20 +1,65 @@
 """Shared helpers for CLI commands."""
 
 import asyncio
+import sys
 from collections.abc import Callable
 from functools import wraps
+from typing import TYPE_CHECKING, Any
 
-from rich.console import Console
+if TYPE_CHECKING:
+    from rich.console import Console
 
-console = Console()
-err_console = Console(stderr=True)
+
+class _LazyConsole:
+    """Stands in for a rich Console, importing rich and building it on first use."""
+
+    def __init__(self, **options: Any) -> None:
+        self._options = options
+        self._console: Console | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._options)
+        return getattr(self._console, name)
+
+
+# Most invocations are `--help` or fail argument parsing, so rich waits for real output
+console: "Console" = _LazyConsole()  # type: ignore[assignment]
+err_console: "Console" = _LazyConsole(stderr=True)  # type: ignore[assignment]
+
+
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    # uvloop comes with uvicorn[standard] except on Windows; fall back to asyncio's loop
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+async def _dispose_connections() -> None:
+    # Pooled connections belong to the loop that opened them, and every command runs on
+    # a loop of its own; close them before it does rather than leave them to the next
+    # command (or garbage collection). Skipped for modules the command never imported.
+    if (database := sys.modules.get("gatekeeper.database")) is not None:
+        await database.engine.dispose()
+    if (email := sys.modules.get("gatekeeper.services.email")) is not None:
+        await email.close_email_connections()
 
 
 def run_async[T](func: Callable[..., T]) -> Callable[..., T]:
     """Decorator to run async functions from Typer commands."""
 
+    async def run(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            await _dispose_connections()
+
     @wraps(func)
     def wrapper(*args, **kwargs):
-        return asyncio.run(func(*args, **kwargs))
+        return asyncio.run(run(*args, **kwargs), loop_factory=_loop_factory())
 
     return wrapper
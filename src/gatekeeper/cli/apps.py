@@ -1,18 +1,13 @@
 """App management CLI commands."""
 
 import re
-import uuid
 from typing import Annotated
 
 import typer
-from rich.table import Table
-from sqlalchemy import select
 
 from gatekeeper.cli._helpers import console, err_console, run_async
-from gatekeeper.database import async_session_maker
-from gatekeeper.models.app import App, UserAppAccess
-from gatekeeper.models.user import User
 
+# Database and model imports live in the commands, keeping `gk --help` light
 app = typer.Typer(no_args_is_help=True, help="App management commands.")
 
 
@@ -23,6 +18,11 @@ async def add(
     name: Annotated[str, typer.Option("--name", "-n", help="Display name for the app")],
 ):
     """Register a new app."""
+    from sqlalchemy import exists, select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App
+
     slug = slug.lower().strip()
 
     if not re.match(r"^[a-z0-9-]+$", slug):
@@ -31,15 +31,11 @@ async def add(
         raise typer.Exit(code=1)
 
     async with async_session_maker() as db:
-        stmt = select(App).where(App.slug == slug)
-        result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
-
-        if existing:
+        if await db.scalar(select(exists().where(App.slug == slug))):
             err_console.print(f"[red]Error:[/red] App with slug '{slug}' already exists")
             raise typer.Exit(code=1)
 
-        new_app = App(id=uuid.uuid4(), slug=slug, name=name)
+        new_app = App(slug=slug, name=name)
         db.add(new_app)
         await db.commit()
         console.print(f"[green]\u2713[/green] Created app: {slug} ({name})")
@@ -49,6 +45,12 @@ async def add(
 @run_async
 async def list_apps():
     """List all registered apps."""
+    from rich.table import Table
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App, UserAppAccess
+
     async with async_session_maker() as db:
         stmt = select(App).order_by(App.created_at.desc())
         result = await db.execute(stmt)
@@ -87,6 +89,13 @@ async def show(
     slug: Annotated[str, typer.Option("--slug", "-s", help="App slug to show")],
 ):
     """Show app details and users with access."""
+    from rich.table import Table
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App, UserAppAccess
+    from gatekeeper.models.user import User
+
     slug = slug.lower().strip()
 
     async with async_session_maker() as db:
@@ -151,6 +160,12 @@ async def grant(
     ] = False,
 ):
     """Grant a user access to an app."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App, UserAppAccess
+    from gatekeeper.models.user import User, UserStatus
+
     if not email and not all_approved:
         err_console.print("[red]Error:[/red] Provide --email or --all-approved")
         raise typer.Exit(code=1)
@@ -168,22 +183,18 @@ async def grant(
             raise typer.Exit(code=1)
 
         if all_approved:
-            from gatekeeper.models.user import UserStatus
-
             # Get all approved users
             users_stmt = select(User).where(User.status == UserStatus.APPROVED)
             users_result = await db.execute(users_stmt)
             users = users_result.scalars().all()
 
+            # Users who already have access, fetched once rather than checked per user
+            existing_stmt = select(UserAppAccess.user_id).where(UserAppAccess.app_id == app_obj.id)
+            existing_user_ids = set((await db.execute(existing_stmt)).scalars())
+
             granted = 0
             for user in users:
-                # Check if already has access
-                existing_stmt = select(UserAppAccess).where(
-                    UserAppAccess.user_id == user.id,
-                    UserAppAccess.app_id == app_obj.id,
-                )
-                existing_result = await db.execute(existing_stmt)
-                if existing_result.scalar_one_or_none():
+                if user.id in existing_user_ids:
                     continue
 
                 access = UserAppAccess(
@@ -254,6 +265,12 @@ async def revoke(
     email: Annotated[str, typer.Option("--email", "-e", help="User email to revoke access")],
 ):
     """Revoke a user's access to an app."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App, UserAppAccess
+    from gatekeeper.models.user import User
+
     slug = slug.lower().strip()
     email = email.lower().strip()
 
@@ -300,6 +317,11 @@ async def remove(
     force: Annotated[bool, typer.Option("--force", "-f", help="Skip confirmation prompt")] = False,
 ):
     """Remove an app and all associated access grants."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.app import App
+
     slug = slug.lower().strip()
 
     if not force:
@@ -3,18 +3,13 @@
 from typing import Annotated
 
 import typer
-from sqlalchemy import delete, func, select, text
 
 from gatekeeper.cli._helpers import console, err_console, run_async
-from gatekeeper.config import get_settings
-from gatekeeper.database import async_session_maker
-from gatekeeper.models.session import Session
-from gatekeeper.models.user import User
 
+# Settings, SQLAlchemy, the models and the database engine are imported inside the
+# commands that use them, so `gk ops --help` and `gk ops serve` don't pay for them up front.
 app = typer.Typer(no_args_is_help=True, help="Operational commands.")
 
-settings = get_settings()
-
 
 @app.command("test-email")
 @run_async
@@ -22,91 +17,102 @@ async def test_email(
     to: Annotated[str, typer.Option("--to", help="Recipient email address")],
 ):
     """Send a test email to verify email configuration."""
-    async with async_session_maker() as db:
-        try:
-            from gatekeeper.services.email import EmailService
-
-            email_service = EmailService(db=db)
-
-            # Use a simple test method
-            sent = await email_service._send_email(
-                to=to,
-                subject=f"[{settings.app_name}] Test Email",
-                body_text=(
-                    "This is a test email from Gatekeeper.\n\n"
-                    "If you're reading this, your email configuration is working correctly."
-                ),
-                body_html=(
-                    "<p>This is a test email from Gatekeeper.</p>"
-                    "<p>If you're reading this, your email configuration is working correctly.</p>"
-                ),
-            )
+    from gatekeeper.config import get_settings
+    from gatekeeper.services.email import EmailService
 
-            if sent:
-                console.print(
-                    f"[green]\u2713[/green] Test email sent to {to} via {settings.email_provider}"
-                )
-            else:
-                err_console.print("[red]\u2717[/red] Failed to send test email")
-                raise typer.Exit(code=1)
-        except Exception as e:
-            err_console.print(f"[red]✗[/red] Failed to send email: {e}")
-            raise typer.Exit(code=1) from None
+    settings = get_settings()
+    try:
+        # Sent straight through the provider: no database, no suppression list
+        sent = await EmailService(settings).provider.send_email(
+            to_email=to,
+            subject=f"[{settings.app_name}] Test Email",
+            html_body=(
+                "<p>This is a test email from Gatekeeper.</p>"
+                "<p>If you're reading this, your email configuration is working correctly.</p>"
+            ),
+            text_body=(
+                "This is a test email from Gatekeeper.\n\n"
+                "If you're reading this, your email configuration is working correctly."
+            ),
+        )
+    except Exception as e:
+        err_console.print(f"[red]✗[/red] Failed to send email: {e}")
+        raise typer.Exit(code=1) from None
+
+    if sent:
+        console.print(
+            f"[green]\u2713[/green] Test email sent to {to} via {settings.email_provider}"
+        )
+    else:
+        err_console.print("[red]\u2717[/red] Failed to send test email")
+        raise typer.Exit(code=1)
 
 
 @app.command()
 @run_async
 async def healthcheck():
     """Check that the deployment is correctly configured."""
+    from sqlalchemy import func, select, table
+
+    from gatekeeper.config import get_settings
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User
+    from gatekeeper.services.email import EmailService
+
+    settings = get_settings()
     all_ok = True
 
-    # Database
+    # Every database check shares one session, and the counts one statement
+    db_error: Exception | None = None
     try:
         async with async_session_maker() as db:
-            # Check connection
-            result = await db.execute(text("SELECT 1"))
-            result.scalar()
-
-            # Count migrations
-            migration_count = 0
-            try:
-                result = await db.execute(text("SELECT COUNT(*) FROM _migrations"))
-                migration_count = result.scalar() or 0
-            except Exception:
-                pass  # Table might not exist
-
-            db_type = "SQLite" if "sqlite" in settings.database_url else "PostgreSQL"
-            console.print(
-                f"Database:     [green]✓[/green] connected "
-                f"({db_type}, {migration_count} migrations applied)"
+            migrations = select(func.count()).select_from(table("_migrations"))
+            admins = select(func.count()).select_from(User).where(User.is_admin == True)  # noqa: E712
+            stmt = select(
+                migrations.scalar_subquery().label("migrations"),
+                admins.scalar_subquery().label("admins"),
             )
+            counts = (await db.execute(stmt)).one()
+
+            stmt = select(User.status, func.count()).group_by(User.status)
+            result = await db.execute(stmt)
+            by_status = {status.value: count for status, count in result}
     except Exception as e:
-        console.print(f"Database:     [red]\u2717[/red] {e}")
+        db_error = e
+
+    # Database
+    if db_error is None:
+        db_type = "SQLite" if "sqlite" in settings.database_url else "PostgreSQL"
+        console.print(
+            f"Database:     [green]✓[/green] connected "
+            f"({db_type}, {counts.migrations} migrations applied)"
+        )
+    else:
+        console.print(f"Database:     [red]\u2717[/red] {db_error}")
         all_ok = False
 
     # Admin user
-    try:
-        async with async_session_maker() as db:
-            stmt = select(func.count(User.id)).where(User.is_admin == True)  # noqa: E712
-            result = await db.execute(stmt)
-            admin_count = result.scalar() or 0
-
-            if admin_count > 0:
-                console.print(f"Admin user:   [green]\u2713[/green] {admin_count} admin(s) found")
-            else:
-                console.print("Admin user:   [red]\u2717[/red] no admin users found")
-                all_ok = False
-    except Exception:
-        pass
-
-    # Email config
-    if settings.email_provider:
-        provider = settings.email_provider.upper()
-        from_addr = settings.email_from_address
-        console.print(f"Email:        [green]✓[/green] {provider} configured (from: {from_addr})")
-    else:
-        console.print("Email:        [red]\u2717[/red] email provider not configured")
+    if db_error is None:
+        if counts.admins > 0:
+            console.print(f"Admin user:   [green]\u2713[/green] {counts.admins} admin(s) found")
+        else:
+            console.print("Admin user:   [red]\u2717[/red] no admin users found")
+            all_ok = False
+
+    # Email: configured, and the provider answers with these credentials
+    provider = settings.email_provider.upper()
+    if not settings.from_email:
+        console.print(f"Email:        [red]\u2717[/red] {provider} has no from address configured")
         all_ok = False
+    else:
+        try:
+            await EmailService(settings).ping()
+            console.print(
+                f"Email:        [green]✓[/green] {provider} reachable (from: {settings.from_email})"
+            )
+        except Exception as e:
+            console.print(f"Email:        [red]\u2717[/red] {provider} unreachable: {e}")
+            all_ok = False
 
     # WebAuthn
     if settings.webauthn_rp_id and settings.webauthn_origin:
@@ -117,19 +123,10 @@ async def healthcheck():
         console.print("WebAuthn:     [yellow]\u26a0[/yellow] not configured (passkeys disabled)")
 
     # User stats
-    try:
-        async with async_session_maker() as db:
-            stmt = select(User)
-            result = await db.execute(stmt)
-            users = result.scalars().all()
-
-            by_status: dict[str, int] = {}
-            for u in users:
-                by_status[u.status.value] = by_status.get(u.status.value, 0) + 1
-            summary = ", ".join(f"{v} {k}" for k, v in by_status.items())
-            console.print(f"Users:        {len(users)} total ({summary})")
-    except Exception:
-        pass
+    if db_error is None:
+        total = sum(by_status.values())
+        summary = ", ".join(f"{v} {k}" for k, v in by_status.items())
+        console.print(f"Users:        {total} total ({summary})")
 
     if not all_ok:
         raise typer.Exit(code=1)
@@ -144,6 +141,12 @@ async def reset_sessions(
     ] = None,
 ):
     """Clear active sessions. All sessions if no email specified."""
+    from sqlalchemy import delete, select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.session import Session
+    from gatekeeper.models.user import User
+
     if not email:
         confirm = typer.confirm(
             "Clear ALL active sessions? Every user will need to re-authenticate."
@@ -157,35 +160,28 @@ async def reset_sessions(
             email = email.lower().strip()
 
             # Find user
-            user_stmt = select(User).where(User.email == email)
+            user_stmt = select(User.id).where(User.email == email)
             user_result = await db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
+            user_id = user_result.scalar_one_or_none()
 
-            if not user:
+            if not user_id:
                 err_console.print(f"[red]Error:[/red] User {email} not found.")
                 raise typer.Exit(code=1)
 
-            # Count and delete sessions
-            count_stmt = select(func.count(Session.id)).where(Session.user_id == user.id)
-            count_result = await db.execute(count_stmt)
-            count = count_result.scalar() or 0
-
-            delete_stmt = delete(Session).where(Session.user_id == user.id)
-            await db.execute(delete_stmt)
+            # Delete sessions; the rowcount is the number cleared
+            delete_stmt = delete(Session).where(Session.user_id == user_id)
+            result = await db.execute(delete_stmt)
             await db.commit()
 
-            console.print(f"[green]\u2713[/green] Cleared {count} session(s) for {email}.")
+            console.print(
+                f"[green]\u2713[/green] Cleared {result.rowcount} session(s) for {email}."
+            )
         else:
-            # Count and delete all sessions
-            count_stmt = select(func.count(Session.id))
-            count_result = await db.execute(count_stmt)
-            count = count_result.scalar() or 0
-
-            delete_stmt = delete(Session)
-            await db.execute(delete_stmt)
+            # Delete all sessions
+            result = await db.execute(delete(Session))
             await db.commit()
 
-            console.print(f"[green]\u2713[/green] Cleared {count} session(s).")
+            console.print(f"[green]\u2713[/green] Cleared {result.rowcount} session(s).")
 
 
 @app.command("serve")
@@ -206,6 +202,13 @@ def serve(
         int | None,
         typer.Option("--workers", "-w", help="Number of workers (default: 1, no reload)"),
     ] = None,
+    access_log: Annotated[
+        bool | None,
+        typer.Option(
+            "--access-log/--no-access-log",
+            help="Log every request (default: only with reload)",
+        ),
+    ] = None,
 ):
     """Start the Gatekeeper API server.
 
@@ -222,9 +225,16 @@ def serve(
 
         # Production mode with multiple workers
         gk ops serve --no-reload --workers 4
+
+        # Production mode, keeping the per-request access log
+        gk ops serve --no-reload --access-log
     """
     import uvicorn
 
+    from gatekeeper.config import get_settings
+
+    settings = get_settings()
+
     # CLI args take precedence over env vars
     final_host = host if host is not None else settings.server_host
     final_port = port if port is not None else settings.server_port
@@ -244,10 +254,14 @@ def serve(
     elif workers and workers > 1:
         console.print(f"[dim]Running with {workers} workers (production mode)[/dim]")
 
+    # Outside development, skip the per-request access log line and the Server header.
+    # uvicorn already picks uvloop and httptools when installed (fastapi[standard]).
     uvicorn.run(
         "gatekeeper.main:app",
         host=final_host,
         port=final_port,
         reload=final_reload,
         workers=workers if not final_reload else None,
+        access_log=access_log if access_log is not None else final_reload,
+        server_header=final_reload,
     )
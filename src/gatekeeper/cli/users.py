@@ -1,18 +1,15 @@
 """User management CLI commands."""
 
 import contextlib
+from collections import Counter
 from enum import Enum
 from typing import Annotated
 
 import typer
-from rich.table import Table
-from sqlalchemy import select
 
 from gatekeeper.cli._helpers import console, err_console, run_async
-from gatekeeper.database import async_session_maker
-from gatekeeper.models.user import User, UserStatus
-from gatekeeper.services.email import EmailService
 
+# Database and model imports live in the commands, keeping `gk --help` light
 app = typer.Typer(no_args_is_help=True, help="User management commands.")
 
 
@@ -34,6 +31,12 @@ async def add(
     name: Annotated[str | None, typer.Option("--name", "-n", help="User display name")] = None,
 ):
     """Add a user to Gatekeeper."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User, UserStatus
+    from gatekeeper.services.email import EmailService
+
     email = email.lower().strip()
 
     async with async_session_maker() as db:
@@ -83,6 +86,12 @@ async def list_users(
     csv: Annotated[bool, typer.Option("--csv", help="Output as CSV for export")] = False,
 ):
     """List all users in the system."""
+    from rich.table import Table
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User, UserStatus
+
     async with async_session_maker() as db:
         stmt = select(User).order_by(User.created_at.desc())
 
@@ -127,9 +136,7 @@ async def list_users(
         console.print(table)
 
         # Summary
-        by_status: dict[str, int] = {}
-        for u in users:
-            by_status[u.status.value] = by_status.get(u.status.value, 0) + 1
+        by_status = Counter(u.status.value for u in users)
         summary = ", ".join(f"{v} {k}" for k, v in by_status.items())
         console.print(f"\n{len(users)} users ({summary})")
 
@@ -145,6 +152,12 @@ async def approve(
     ] = False,
 ):
     """Approve a pending user registration."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User, UserStatus
+    from gatekeeper.services.email import EmailService
+
     if not email and not all_pending:
         err_console.print("[red]Error:[/red] Provide --email or --all-pending")
         raise typer.Exit(code=1)
@@ -199,6 +212,11 @@ async def reject(
     email: Annotated[str, typer.Option("--email", "-e", help="User email to reject")],
 ):
     """Reject a pending user registration."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User, UserStatus
+
     email = email.lower().strip()
 
     async with async_session_maker() as db:
@@ -226,6 +244,11 @@ async def remove(
     force: Annotated[bool, typer.Option("--force", "-f", help="Skip confirmation prompt")] = False,
 ):
     """Remove a user and all their data (sessions, passkeys, OTPs)."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User
+
     email = email.lower().strip()
 
     if not force:
@@ -267,6 +290,11 @@ async def update(
     name: Annotated[str | None, typer.Option("--name", "-n", help="Set display name")] = None,
 ):
     """Update a user's profile or admin status."""
+    from sqlalchemy import select
+
+    from gatekeeper.database import async_session_maker
+    from gatekeeper.models.user import User
+
     email = email.lower().strip()
 
     if admin is None and name is None:
@@ -5,6 +5,18 @@ from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Keyed on the ACCEPTED_DOMAINS string rather than stored on the settings object, so
+# copies made with model_copy(update=...) never see another value's parse
+@lru_cache(maxsize=8)
+def _parse_domains(accepted_domains: str) -> tuple[str, ...]:
+    return tuple(d.strip().lower() for d in accepted_domains.split(",") if d.strip())
+
+
+@lru_cache(maxsize=8)
+def _domain_set(accepted_domains: str) -> frozenset[str]:
+    return frozenset(_parse_domains(accepted_domains))
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -20,6 +32,14 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./gatekeeper.db"
+    # PostgreSQL connection pool; connections are opened up front at startup.
+    # A pool size of 0 disables pooling, for use behind PgBouncer.
+    database_pool_size: int = 20
+    database_max_overflow: int = 20
+    database_pool_timeout: int = 30
+    # Test each connection on checkout. Costs a round trip per checkout; can be turned
+    # off when nothing between Gatekeeper and PostgreSQL drops idle connections.
+    database_pool_pre_ping: bool = True
 
     # Email - Common
     email_provider: Literal["ses", "smtp"] = "ses"
@@ -37,17 +57,24 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_password: str = ""
     smtp_from_email: str = ""
+    # Most notification emails in flight at once when one action notifies many users
+    email_send_concurrency: int = 20
 
     # Auth Config
     accepted_domains: str = ""
     otp_expiry_minutes: int = 5
     session_expiry_days: int = 30
+    # Seconds a verified session token, and /validate answers for it, are trusted
+    # without re-reading the database. Set to 0 to disable the cache.
+    session_cache_ttl_seconds: int = 30
     cookie_domain: str | None = None  # e.g., ".example.com" for multi-app SSO
 
     # Multi-App Config
     # "allow" = unregistered apps allow any authenticated user
     # "deny" = unregistered apps return 403
     default_app_access: Literal["allow", "deny"] = "allow"
+    # Rows per INSERT statement when bulk granting access
+    bulk_grant_batch_size: int = 500
 
     # WebAuthn
     webauthn_rp_id: str = "localhost"
@@ -62,9 +89,7 @@ class Settings(BaseSettings):
     @computed_field
     @property
     def accepted_domains_list(self) -> list[str]:
-        if not self.accepted_domains:
-            return []
-        return [d.strip().lower() for d in self.accepted_domains.split(",") if d.strip()]
+        return list(_parse_domains(self.accepted_domains))
 
     @computed_field
     @property
@@ -74,10 +99,7 @@ class Settings(BaseSettings):
         return self.smtp_from_email
 
     def is_accepted_domain(self, email: str) -> bool:
-        if not self.accepted_domains_list:
-            return False
-        domain = email.split("@")[-1].lower()
-        return domain in self.accepted_domains_list
+        return email.rpartition("@")[2].lower() in _domain_set(self.accepted_domains)
 
 
 @lru_cache
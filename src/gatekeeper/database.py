@@ -1,20 +1,58 @@
-from collections.abc import AsyncGenerator
+import asyncio
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
 
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
-from gatekeeper.config import get_settings
+from gatekeeper.config import Settings, get_settings
 
 
 class Base(DeclarativeBase):
-    pass
+    # Fetch server-generated columns (created_at, updated_at) as part of the
+    # flush via RETURNING, so freshly written rows don't need a refresh().
+    __mapper_args__ = {"eager_defaults": True}  # noqa: RUF012
 
 
 settings = get_settings()
 
+
+def _engine_options(settings: Settings) -> dict[str, Any]:
+    # Room for every distinct statement shape the API and CLI build, so none are
+    # evicted from the compiled SQL cache and recompiled under load
+    options: dict[str, Any] = {"query_cache_size": 1200}
+    if not settings.database_url.startswith("postgresql+asyncpg"):
+        return options
+    if settings.database_pool_size <= 0:
+        # An external pooler such as PgBouncer owns the connections. In transaction
+        # mode it can't keep prepared statements per client, so don't cache them.
+        return options | {
+            "poolclass": NullPool,
+            "connect_args": {"statement_cache_size": 0},
+        }
+    return options | {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout,
+        "pool_recycle": 1800,
+        # Connections idled out by the server or a cloud proxy are replaced, not handed out
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "connect_args": {
+            # JIT compilation makes asyncpg's type introspection queries slow to plan
+            "server_settings": {"jit": "off"},
+            "statement_cache_size": 1024,
+        },
+    }
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,
+    **_engine_options(settings),
 )
 
 async_session_maker = async_sessionmaker(
@@ -41,6 +79,21 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
+def dialect_insert(session: AsyncSession) -> Callable[..., Any]:
+    """The PostgreSQL or SQLite insert() for this session, both of which support ON CONFLICT."""
+    return pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Call `callback` once the session's current transaction has committed.
+
+    For clearing in-process caches of rows the request changed. `get_db` commits after
+    the response is sent, and a request that reads the rows before then would cache the
+    old values again.
+    """
+    event.listen(session.sync_session, "after_commit", lambda _: callback(), once=True)
+
+
 async def init_db() -> None:
     """Initialize database connection.
 
@@ -50,3 +103,18 @@ async def init_db() -> None:
     # Verify connection works
     async with engine.begin():
         pass
+
+    if engine.dialect.name == "postgresql" and settings.database_pool_size > 0:
+        await _warm_pool(settings.database_pool_size)
+
+
+async def _warm_pool(size: int) -> None:
+    """Open `size` pooled connections so the first requests don't pay for connection setup."""
+
+    async def checkout() -> None:
+        async with engine.connect():
+            # Hold the connection until all are open, or the pool just reuses one
+            await barrier.wait()
+
+    barrier = asyncio.Barrier(size)
+    await asyncio.gather(*(checkout() for _ in range(size)))
@@ -5,6 +5,8 @@ Supports both SQLite and PostgreSQL.
 
 import argparse
 import asyncio
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 
 from gatekeeper.config import get_settings
@@ -12,6 +14,12 @@ from gatekeeper.config import get_settings
 MIGRATIONS_DIR = Path(__file__).parent / "migrations"
 
 
+@lru_cache(maxsize=1)
+def _migration_files() -> tuple[Path, ...]:
+    """Migration files in apply order; the directory is only listed once per process."""
+    return tuple(sorted(MIGRATIONS_DIR.glob("*.sql")))
+
+
 def get_db_info() -> tuple[str, str]:
     """Get database type and connection string.
 
@@ -36,6 +44,20 @@ def get_db_info() -> tuple[str, str]:
     raise ValueError(f"Unsupported database URL: {db_url}")
 
 
+def _pending_migrations(
+    migration_files: Sequence[Path], applied: set[str], target: int | None
+) -> list[Path]:
+    """Migration files not yet applied, in order."""
+    pending = []
+    for mf in migration_files:
+        if mf.name in applied:
+            if target is not None:
+                print(f"Migration {mf.name} already applied.")
+            continue
+        pending.append(mf)
+    return pending
+
+
 async def run_sqlite_migrations(db_path: str, target: int | None = None) -> None:
     """Run migrations on SQLite database."""
     import aiosqlite
@@ -51,7 +73,7 @@ async def run_sqlite_migrations(db_path: str, target: int | None = None) -> None
             applied = set()
 
         # Get migration files
-        migration_files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+        migration_files = _migration_files()
         if not migration_files:
             print("No migration files found.")
             return
@@ -64,25 +86,28 @@ async def run_sqlite_migrations(db_path: str, target: int | None = None) -> None
                 print(f"No migration found with number {target}")
                 return
 
-        # Apply pending migrations
-        count = 0
-        for mf in migration_files:
-            if mf.name in applied:
-                if target is not None:
-                    print(f"Migration {mf.name} already applied.")
-                continue
+        pending = _pending_migrations(migration_files, applied, target)
+        if not pending:
+            print("All migrations already applied.")
+            return
 
+        # Apply pending migrations as one script in a single transaction. executescript
+        # runs outside the driver's transaction handling, so BEGIN/COMMIT are explicit.
+        script = ["BEGIN IMMEDIATE;"]
+        for mf in pending:
             print(f"Applying: {mf.name}")
-            sql = mf.read_text()
-            await db.executescript(sql)
-            await db.execute("INSERT INTO _migrations (name) VALUES (?)", (mf.name,))
-            await db.commit()
-            count += 1
+            name = mf.name.replace("'", "''")
+            script.append(mf.read_text())
+            script.append(f";\nINSERT INTO _migrations (name) VALUES ('{name}');")
+        script.append("COMMIT;")
 
-        if count == 0:
-            print("All migrations already applied.")
-        else:
-            print(f"\nApplied {count} migration(s).")
+        try:
+            await db.executescript("\n".join(script))
+        except Exception:
+            await db.rollback()
+            raise
+
+        print(f"\nApplied {len(pending)} migration(s).")
 
 
 def run_postgres_migrations(conn_str: str, target: int | None = None) -> None:
@@ -111,7 +136,7 @@ def run_postgres_migrations(conn_str: str, target: int | None = None) -> None:
         applied = {row[0] for row in cur.fetchall()}
 
         # Get migration files
-        migration_files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+        migration_files = _migration_files()
         if not migration_files:
             print("No migration files found.")
             return
@@ -124,14 +149,15 @@ def run_postgres_migrations(conn_str: str, target: int | None = None) -> None:
                 print(f"No migration found with number {target}")
                 return
 
-        # Apply pending migrations
-        count = 0
-        for mf in migration_files:
-            if mf.name in applied:
-                if target is not None:
-                    print(f"Migration {mf.name} already applied.")
-                continue
+        pending = _pending_migrations(migration_files, applied, target)
+        if not pending:
+            print("All migrations already applied.")
+            return
 
+        # Apply pending migrations in a single transaction, sent to the server as one
+        # batch of statements so applying N migrations costs one round trip, not N
+        script = []
+        for mf in pending:
             print(f"Applying: {mf.name}")
             sql = mf.read_text()
 
@@ -139,15 +165,14 @@ def run_postgres_migrations(conn_str: str, target: int | None = None) -> None:
             sql = sql.replace("INTEGER PRIMARY KEY", "SERIAL PRIMARY KEY")
             sql = sql.replace("BLOB", "BYTEA")
 
-            cur.execute(sql)
-            cur.execute("INSERT INTO _migrations (name) VALUES (%s)", (mf.name,))
-            conn.commit()
-            count += 1
+            script.append(sql)
+        names = b", ".join(cur.mogrify("(%s)", (mf.name,)) for mf in pending).decode()
+        script.append(f"INSERT INTO _migrations (name) VALUES {names}")
 
-        if count == 0:
-            print("All migrations already applied.")
-        else:
-            print(f"\nApplied {count} migration(s).")
+        cur.execute("\n;\n".join(script))
+        conn.commit()
+
+        print(f"\nApplied {len(pending)} migration(s).")
 
     except Exception as e:
         conn.rollback()
@@ -170,7 +195,7 @@ async def run_migrations(target: int | None = None) -> None:
 async def show_status() -> None:
     """Show migration status."""
     db_type, conn_str = get_db_info()
-    migration_files = sorted(MIGRATIONS_DIR.glob("*.sql"))
+    migration_files = _migration_files()
 
     if db_type == "sqlite":
         import aiosqlite
@@ -0,0 +1,10 @@
+-- Migration 005: Composite indexes for the admin list queries
+-- Emails are stored lowercased and apps.slug / user_app_access (user_id, app_id)
+-- are already unique, so only the filtered + ordered listings need new indexes.
+
+-- Admin user list: WHERE status = ? ORDER BY created_at
+CREATE INDEX IF NOT EXISTS idx_users_status_created_at ON users(status, created_at);
+
+-- App user list: WHERE app_id = ? ORDER BY granted_at (also covers plain app_id lookups)
+CREATE INDEX IF NOT EXISTS idx_user_app_access_app_granted_at ON user_app_access(app_id, granted_at);
+DROP INDEX IF EXISTS idx_user_app_access_app;
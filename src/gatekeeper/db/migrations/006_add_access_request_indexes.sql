@@ -0,0 +1,11 @@
+-- Migration 006: Indexes for the access request listings
+-- Per-app list: WHERE app_id = ? AND status = ? ORDER BY created_at
+-- (INCLUDE columns would be PostgreSQL-only, so the index stays portable)
+CREATE INDEX IF NOT EXISTS idx_app_access_requests_app_status_created_at
+    ON app_access_requests(app_id, status, created_at);
+DROP INDEX IF EXISTS idx_app_access_requests_app_status;
+
+-- Cross-app list: WHERE status = 'pending' ORDER BY created_at; reviewed requests
+-- pile up over time, so only the pending ones are indexed
+CREATE INDEX IF NOT EXISTS idx_app_access_requests_pending_created_at
+    ON app_access_requests(created_at) WHERE status = 'pending';
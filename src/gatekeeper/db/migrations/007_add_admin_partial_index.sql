@@ -0,0 +1,5 @@
+-- Migration 007: Partial index over admin users
+-- Healthcheck's admin count, admin notification lookups and `gk users list --admin`
+-- all filter on is_admin = 1; admins are a handful of rows, so only they are indexed.
+-- The queries must compare with = (not IS) for SQLite to pick the partial index.
+CREATE INDEX IF NOT EXISTS idx_users_admin ON users(is_admin) WHERE is_admin = 1;
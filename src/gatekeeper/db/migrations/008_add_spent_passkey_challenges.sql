@@ -0,0 +1,9 @@
+-- Migration 008: Spent passkey challenges
+-- Challenges are signed rather than stored, so single use is enforced by recording each
+-- redeemed nonce here, where every worker sees it. Rows past expires_at are pruned as
+-- new challenges are redeemed.
+CREATE TABLE IF NOT EXISTS spent_passkey_challenges (
+    nonce BLOB PRIMARY KEY,
+    expires_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_spent_passkey_challenges_expires_at ON spent_passkey_challenges(expires_at);
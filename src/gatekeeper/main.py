@@ -1,11 +1,10 @@
+import mimetypes
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -13,6 +12,8 @@ from gatekeeper.api.v1.router import router as v1_router
 from gatekeeper.config import get_settings
 from gatekeeper.database import init_db
 from gatekeeper.rate_limit import limiter
+from gatekeeper.services.email import close_email_connections
+from gatekeeper.utils.cors import SingleOriginCORSMiddleware
 
 STATIC_DIR = Path(__file__).parent / "static"
 
@@ -23,6 +24,7 @@ settings = get_settings()
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     yield
+    await close_email_connections()
 
 
 app = FastAPI(
@@ -36,13 +38,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[settings.frontend_url],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Only the API is called cross-origin; static files and /health skip CORS entirely
+app.add_middleware(SingleOriginCORSMiddleware, origin=settings.frontend_url, path_prefix="/api/")
 
 # Rate limiting
 app.state.limiter = limiter
@@ -50,20 +47,51 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 app.include_router(v1_router, prefix="/api/v1")
 
-if STATIC_DIR.exists():
-    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+def _load_static_files() -> dict[str, tuple[bytes, str]]:
+    # The bundled assets are a few small files; hold them in memory rather than
+    # opening and stat-ing them on every request
+    files: dict[str, tuple[bytes, str]] = {}
+    if STATIC_DIR.exists():
+        for path in STATIC_DIR.rglob("*"):
+            if path.is_file():
+                media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+                files[path.relative_to(STATIC_DIR).as_posix()] = (path.read_bytes(), media_type)
+    return files
+
+
+_STATIC_FILES = _load_static_files()
+
+
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def static_file(path: str) -> Response:
+    if (file := _STATIC_FILES.get(path)) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    content, media_type = file
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=86400"},
+    )
+
+
+# Fixed responses, built once: nothing mutates a response after it's returned, and load
+# balancers poll /health often
+_ROOT_REDIRECT = RedirectResponse(url="/api/v1")
+_FAVICON_REDIRECT = RedirectResponse(url="/static/favicon.svg")
+_HEALTHY = JSONResponse({"status": "healthy"})
 
 
 @app.get("/", include_in_schema=False)
 async def root_redirect() -> RedirectResponse:
-    return RedirectResponse(url="/api/v1")
+    return _ROOT_REDIRECT
 
 
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon() -> RedirectResponse:
-    return RedirectResponse(url="/static/favicon.svg")
+    return _FAVICON_REDIRECT
 
 
-@app.get("/health", tags=["Health"])
-async def health_check() -> dict[str, str]:
-    return {"status": "healthy"}
+@app.get("/health", tags=["Health"], response_model=dict[str, str])
+async def health_check() -> JSONResponse:
+    return _HEALTHY
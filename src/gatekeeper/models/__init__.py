@@ -1,7 +1,7 @@
 from gatekeeper.models.app import App, UserAppAccess
 from gatekeeper.models.email_suppression import EmailSuppression, SuppressionReason
 from gatekeeper.models.otp import OTP, OTPPurpose
-from gatekeeper.models.passkey import PasskeyCredential
+from gatekeeper.models.passkey import PasskeyCredential, SpentPasskeyChallenge
 from gatekeeper.models.session import Session
 from gatekeeper.models.user import User, UserStatus
 
@@ -12,6 +12,7 @@ __all__ = [
     "OTPPurpose",
     "PasskeyCredential",
     "Session",
+    "SpentPasskeyChallenge",
     "SuppressionReason",
     "User",
     "UserAppAccess",
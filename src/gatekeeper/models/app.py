@@ -2,10 +2,11 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gatekeeper.database import Base
+from gatekeeper.utils.ids import uuid7
 
 
 class AccessRequestStatus(str, enum.Enum):
@@ -17,7 +18,7 @@ class AccessRequestStatus(str, enum.Enum):
 class App(Base):
     __tablename__ = "apps"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     slug: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     is_public: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -38,6 +39,7 @@ class App(Base):
 
 class UserAppAccess(Base):
     __tablename__ = "user_app_access"
+    __table_args__ = (Index("idx_user_app_access_app_granted_at", "app_id", "granted_at"),)
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
@@ -60,8 +62,17 @@ class UserAppAccess(Base):
 
 class AppAccessRequest(Base):
     __tablename__ = "app_access_requests"
+    __table_args__ = (
+        Index("idx_app_access_requests_app_status_created_at", "app_id", "status", "created_at"),
+        Index(
+            "idx_app_access_requests_pending_created_at",
+            "created_at",
+            sqlite_where=text("status = 'pending'"),
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -71,7 +82,12 @@ class AppAccessRequest(Base):
     requested_role: Mapped[str | None] = mapped_column(String(100), nullable=True)
     message: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[AccessRequestStatus] = mapped_column(
-        Enum(AccessRequestStatus, values_callable=lambda x: [e.value for e in x]),
+        Enum(
+            AccessRequestStatus,
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=False,
+            create_constraint=True,
+        ),
         default=AccessRequestStatus.PENDING,
         nullable=False,
     )
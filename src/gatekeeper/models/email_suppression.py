@@ -6,6 +6,7 @@ from sqlalchemy import DateTime, Enum, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from gatekeeper.database import Base
+from gatekeeper.utils.ids import uuid7
 
 
 class SuppressionReason(str, enum.Enum):
@@ -16,10 +17,16 @@ class SuppressionReason(str, enum.Enum):
 class EmailSuppression(Base):
     __tablename__ = "email_suppressions"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     reason: Mapped[SuppressionReason] = mapped_column(
-        Enum(SuppressionReason, values_callable=lambda x: [e.value for e in x]), nullable=False
+        Enum(
+            SuppressionReason,
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=False,
+            create_constraint=True,
+        ),
+        nullable=False,
     )
     details: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
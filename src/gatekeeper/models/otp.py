@@ -22,7 +22,13 @@ class OTP(Base):
     email: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
     code: Mapped[str] = mapped_column(String(6), nullable=False)
     purpose: Mapped[OTPPurpose] = mapped_column(
-        Enum(OTPPurpose, values_callable=lambda x: [e.value for e in x]), nullable=False
+        Enum(
+            OTPPurpose,
+            values_callable=lambda x: [e.value for e in x],
+            native_enum=False,
+            create_constraint=True,
+        ),
+        nullable=False,
     )
     expires_at: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
     used: Mapped[bool] = mapped_column(default=False, nullable=False)
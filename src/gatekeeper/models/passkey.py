@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gatekeeper.database import Base
@@ -37,3 +37,16 @@ class PasskeyCredential(Base):
     @transports_list.setter
     def transports_list(self, value: list[str]) -> None:
         self.transports = ",".join(value) if value else None
+
+
+class SpentPasskeyChallenge(Base):
+    """A redeemed passkey challenge's nonce, kept until the challenge would have expired.
+
+    Shared by every worker, so a challenge can't be redeemed twice on different ones.
+    """
+
+    __tablename__ = "spent_passkey_challenges"
+    __table_args__ = (Index("idx_spent_passkey_challenges_expires_at", "expires_at"),)
+
+    nonce: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(), nullable=False)
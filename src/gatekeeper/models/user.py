@@ -2,10 +2,11 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, String, func
+from sqlalchemy import DateTime, Enum, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from gatekeeper.database import Base
+from gatekeeper.utils.ids import uuid7
 
 
 class UserStatus(str, enum.Enum):
@@ -16,12 +17,27 @@ class UserStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("idx_users_status_created_at", "status", "created_at"),
+        Index(
+            "idx_users_admin",
+            "is_admin",
+            sqlite_where=text("is_admin = 1"),
+            postgresql_where=text("is_admin = 1"),
+        ),
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     status: Mapped[UserStatus] = mapped_column(
-        Enum(UserStatus, values_callable=lambda x: [e.value for e in x]),
+        Enum(
+            UserStatus,
+            values_callable=lambda x: [e.value for e in x],
+            # Migrations store enums as TEXT with a CHECK constraint, not a PostgreSQL ENUM type
+            native_enum=False,
+            create_constraint=True,
+        ),
         default=UserStatus.PENDING,
         nullable=False,
     )
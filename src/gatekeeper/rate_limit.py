@@ -11,4 +11,6 @@ def get_client_ip(request: Request) -> str:
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=get_client_ip)
+# Sliding window counters weight the previous window's hits, so a client can't spend two
+# windows' worth of requests either side of a boundary. Still O(1) state per key.
+limiter = Limiter(key_func=get_client_ip, strategy="sliding-window-counter")
@@ -1,13 +1,13 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 
 from gatekeeper.models.user import UserStatus
-from gatekeeper.schemas.user import UserRead
+from gatekeeper.schemas.user import LowercaseEmail, UserRead
 
 
 class AdminCreateUser(BaseModel):
     """Request to create a new user as admin."""
 
-    email: EmailStr = Field(..., description="Email address for the new user")
+    email: LowercaseEmail = Field(..., description="Email address for the new user")
     is_admin: bool = Field(default=False, description="Grant admin privileges to user")
     auto_approve: bool = Field(
         default=True,
@@ -4,6 +4,8 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from gatekeeper.models.app import AccessRequestStatus
 
+_FROM_ATTRS = ConfigDict(from_attributes=True)
+
 
 class AppCreate(BaseModel):
     slug: str = Field(..., min_length=1, max_length=100, pattern=r"^[a-z0-9-]+$")
@@ -19,7 +21,7 @@ class AppCreate(BaseModel):
 
 
 class AppRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _FROM_ATTRS
 
     id: str
     slug: str
@@ -34,7 +36,7 @@ class AppRead(BaseModel):
 class AppPublic(BaseModel):
     """Schema for user-facing app information (discovery)."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _FROM_ATTRS
 
     slug: str
     name: str
@@ -58,7 +60,7 @@ class AppList(BaseModel):
 
 
 class AppUserAccess(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _FROM_ATTRS
 
     email: str
     role: str | None
@@ -67,7 +69,7 @@ class AppUserAccess(BaseModel):
 
 
 class AppDetail(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _FROM_ATTRS
 
     id: str
     slug: str
@@ -96,7 +98,7 @@ class AccessRequestCreate(BaseModel):
 
 
 class AccessRequestRead(BaseModel):
-    model_config = ConfigDict(from_attributes=True)
+    model_config = _FROM_ATTRS
 
     id: str
     user_email: str
@@ -2,15 +2,16 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
 
 from gatekeeper.models.user import UserStatus
+from gatekeeper.schemas.user import LowercaseEmail
 
 
 class OTPRequest(BaseModel):
     """Request to send an OTP to an email address."""
 
-    email: EmailStr = Field(..., description="Email address to send OTP to")
+    email: LowercaseEmail = Field(..., description="Email address to send OTP to")
 
     model_config = {"json_schema_extra": {"example": {"email": "user@example.com"}}}
 
@@ -18,7 +19,7 @@ class OTPRequest(BaseModel):
 class OTPVerifyRequest(BaseModel):
     """Request to verify an OTP code."""
 
-    email: EmailStr = Field(..., description="Email address used for OTP")
+    email: LowercaseEmail = Field(..., description="Email address used for OTP")
     code: str = Field(
         ...,
         min_length=6,
@@ -35,7 +36,7 @@ class OTPVerifyRequest(BaseModel):
 class PasskeyOptionsRequest(BaseModel):
     """Request to get WebAuthn authentication options."""
 
-    email: EmailStr | None = Field(
+    email: LowercaseEmail | None = Field(
         default=None,
         description="Optional email to filter allowed credentials for this user",
     )
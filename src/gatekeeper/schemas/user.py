@@ -1,15 +1,41 @@
+import re
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AfterValidator, BaseModel, Field, WithJsonSchema
 
 from gatekeeper.models.user import UserStatus
 
+# A syntax check only: an address is proven by the OTP sent to it, so email-validator's
+# full RFC and IDNA checks on every request would add cost without adding safety. The
+# local part is an RFC 5322 dot-atom, so no commas, angle brackets or quotes that would
+# turn a To header into an address list; the domain is two or more non-empty labels.
+_ATEXT = r"[a-z0-9!#$%&'*+/=?^_`{|}~-]+"
+_LABEL = r"[^\W_](?:(?:[^\W_]|-)*[^\W_])?"
+_EMAIL_RE = re.compile(rf"{_ATEXT}(?:\.{_ATEXT})*@{_LABEL}(?:\.{_LABEL})+")
+MAX_EMAIL_LENGTH = 254
+
+
+def _normalize_email(value: str) -> str:
+    value = value.strip().lower()
+    if len(value) > MAX_EMAIL_LENGTH or not _EMAIL_RE.fullmatch(value):
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+# Emails are stored lowercased; normalize once when the request is parsed
+LowercaseEmail = Annotated[
+    str,
+    AfterValidator(_normalize_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
+
 
 class UserCreate(BaseModel):
     """Internal schema for creating a user."""
 
-    email: EmailStr = Field(..., description="User's email address")
+    email: LowercaseEmail = Field(..., description="User's email address")
     status: UserStatus = Field(default=UserStatus.PENDING, description="Initial user status")
     is_admin: bool = Field(default=False, description="Whether user has admin privileges")
 
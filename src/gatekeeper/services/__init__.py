@@ -1,7 +1,10 @@
-from gatekeeper.services.email import EmailService
-from gatekeeper.services.otp import OTPService
-from gatekeeper.services.passkey import PasskeyService
-from gatekeeper.services.session import SessionService
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gatekeeper.services.email import EmailService
+    from gatekeeper.services.otp import OTPService
+    from gatekeeper.services.passkey import PasskeyService
+    from gatekeeper.services.session import SessionService
 
 __all__ = [
     "EmailService",
@@ -9,3 +12,21 @@ __all__ = [
     "PasskeyService",
     "SessionService",
 ]
+
+# Services are imported on first access, so importing one submodule (or the CLI)
+# doesn't pull in the email providers and webauthn along with it.
+_SUBMODULES = {
+    "EmailService": "email",
+    "OTPService": "otp",
+    "PasskeyService": "passkey",
+    "SessionService": "session",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _SUBMODULES:
+        from importlib import import_module
+
+        module = import_module(f"{__name__}.{_SUBMODULES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
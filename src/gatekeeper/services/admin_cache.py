@@ -0,0 +1,56 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from gatekeeper.models.app import AccessRequestStatus
+from gatekeeper.models.user import User
+from gatekeeper.utils.cache import TTLCache
+
+# Admins change rarely, so notification fan-out reads their addresses from here. Changes
+# made through the API clear it once they commit; ones made elsewhere (the CLI) show up
+# within the TTL.
+ADMIN_EMAILS_TTL_SECONDS = 60
+
+# Keyed on notify_only: every admin, or only those opted in to private app requests
+_admin_emails: TTLCache[bool, tuple[str, ...]] = TTLCache(maxsize=2, ttl=ADMIN_EMAILS_TTL_SECONDS)
+
+
+async def get_admin_emails(db: AsyncSession, notify_only: bool = False) -> tuple[str, ...]:
+    """Email addresses of admins, optionally only those notified of private app requests."""
+    if (emails := _admin_emails.get(notify_only)) is not None:
+        return emails
+
+    stmt = select(User.email).where(User.is_admin == True)  # noqa: E712
+    if notify_only:
+        stmt = stmt.where(User.notify_private_app_requests == True)  # noqa: E712
+    result = await db.execute(stmt)
+    emails = tuple(result.scalars())
+    _admin_emails.set(notify_only, emails)
+    return emails
+
+
+def clear_admin_emails() -> None:
+    """Forget the cached admin addresses, after an admin is added, changed or removed.
+
+    Call through `after_commit`.
+    """
+    _admin_emails.clear()
+
+
+# Serialized access request lists keyed on (app slug, status filter); (None, None) is the
+# cross-app list. Cleared once any change to requests, or to the users and apps they
+# name, commits; changes made elsewhere (the CLI) show up within the TTL.
+AccessRequestListKey = tuple[str | None, AccessRequestStatus | None]
+_access_request_lists: TTLCache[AccessRequestListKey, bytes] = TTLCache(maxsize=256, ttl=10)
+
+
+def get_access_request_list(key: AccessRequestListKey) -> bytes | None:
+    return _access_request_lists.get(key)
+
+
+def cache_access_request_list(key: AccessRequestListKey, body: bytes) -> None:
+    _access_request_lists.set(key, body)
+
+
+def clear_access_request_lists() -> None:
+    """Forget the cached access request lists. Call through `after_commit`."""
+    _access_request_lists.clear()
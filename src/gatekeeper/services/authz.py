@@ -0,0 +1,47 @@
+from sqlalchemy import Row, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from gatekeeper.models.app import App, UserAppAccess
+from gatekeeper.models.session import Session
+from gatekeeper.models.user import User
+from gatekeeper.services.session import utcnow
+
+
+async def validate_fast(db: AsyncSession, token: str, app_slug: str | None) -> Row | None:
+    """Resolve a session token, its user and their access to an app in one query.
+
+    Returns None if the session doesn't exist or has expired. Otherwise a row of
+    the session's expires_at, the user's email, name, status and is_admin, plus app_id, is_public,
+    access_user_id and role, which are all None when the app isn't registered
+    (or no app was given) and the access columns None when there's no grant.
+    """
+    user_columns = (User.email, User.name, User.status, User.is_admin)
+    if app_slug is None:
+        app_columns = (
+            null().label("app_id"),
+            null().label("is_public"),
+            null().label("access_user_id"),
+            null().label("role"),
+        )
+    else:
+        app_columns = (
+            App.id.label("app_id"),
+            App.is_public,
+            UserAppAccess.user_id.label("access_user_id"),
+            UserAppAccess.role,
+        )
+
+    stmt = (
+        select(Session.expires_at, *user_columns, *app_columns)
+        .select_from(Session)
+        .join(User, User.id == Session.user_id)
+    )
+    if app_slug is not None:
+        stmt = stmt.outerjoin(App, App.slug == app_slug).outerjoin(
+            UserAppAccess,
+            (UserAppAccess.app_id == App.id) & (UserAppAccess.user_id == User.id),
+        )
+    stmt = stmt.where(Session.token == token, Session.expires_at > utcnow())
+
+    result = await db.execute(stmt)
+    return result.first()
@@ -1,20 +1,45 @@
+import asyncio
 import logging
-import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterable
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-import aiosmtplib
-import boto3
-from botocore.exceptions import ClientError
-from sqlalchemy import select
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gatekeeper.config import Settings, get_settings
 from gatekeeper.models.email_suppression import EmailSuppression, SuppressionReason
+from gatekeeper.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    import aiosmtplib
 
 logger = logging.getLogger(__name__)
 
+# Suppression lookups by address. The list only grows on bounces and complaints, so
+# other workers picking up a new entry within a few minutes is acceptable.
+_suppression_cache: TTLCache[str, bool] = TTLCache(maxsize=10_000, ttl=300)
+
+
+async def send_concurrently(sends: list[Callable[[], Awaitable[bool]]]) -> None:
+    """Run email sends concurrently, so one slow or failing send doesn't hold up the rest.
+
+    At most EMAIL_SEND_CONCURRENCY sends are in flight at once.
+    """
+    semaphore = asyncio.Semaphore(max(1, get_settings().email_send_concurrency))
+
+    async def run(send: Callable[[], Awaitable[bool]]) -> bool:
+        async with semaphore:
+            return await send()
+
+    results = await asyncio.gather(*(run(send) for send in sends), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to send email: {result}")
+
 
 class EmailProvider(ABC):
     @abstractmethod
@@ -27,15 +52,41 @@ class EmailProvider(ABC):
     ) -> bool:
         pass
 
+    @abstractmethod
+    async def ping(self) -> None:
+        """Check the provider is reachable with the configured credentials.
+
+        Raises on failure, without sending anything.
+        """
+
+
+@lru_cache
+def _get_ses_client(
+    access_key_id: str, secret_access_key: str, region: str, max_connections: int
+) -> Any:
+    # boto3 takes a fifth of a second to import, so only SES deployments load it.
+    import boto3
+    from botocore.config import Config
+
+    # boto3 clients are thread-safe and slow to build, so share one per credential set.
+    # Sends run in threads, so keep a pooled HTTPS connection for each one in flight.
+    return boto3.client(
+        "ses",
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        region_name=region,
+        config=Config(max_pool_connections=max(1, max_connections)),
+    )
+
 
 class SESProvider(EmailProvider):
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.client = boto3.client(
-            "ses",
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
+        self.client = _get_ses_client(
+            settings.aws_access_key_id,
+            settings.aws_secret_access_key,
+            settings.aws_region,
+            settings.email_send_concurrency,
         )
 
     async def send_email(
@@ -45,6 +96,8 @@ class SESProvider(EmailProvider):
         html_body: str,
         text_body: str | None = None,
     ) -> bool:
+        from botocore.exceptions import ClientError
+
         try:
             from_address = (
                 f"{self.settings.email_from_name} <{self.settings.ses_from_email}>"
@@ -56,7 +109,10 @@ class SESProvider(EmailProvider):
             if text_body:
                 body["Text"] = {"Charset": "UTF-8", "Data": text_body}
 
-            self.client.send_email(
+            # boto3 is synchronous; run the HTTP call off the event loop so concurrent
+            # sends (and every other request) aren't held up behind it
+            await asyncio.to_thread(
+                self.client.send_email,
                 Source=from_address,
                 Destination={"ToAddresses": [to_email]},
                 Message={
@@ -70,6 +126,99 @@ class SESProvider(EmailProvider):
             logger.error(f"Failed to send email via SES: {e}")
             return False
 
+    async def ping(self) -> None:
+        await asyncio.to_thread(self.client.get_send_quota)
+
+
+async def _smtp_connect(settings: Settings) -> "aiosmtplib.SMTP":
+    """Open an SMTP connection, upgraded with STARTTLS and logged in."""
+    import aiosmtplib
+
+    client = aiosmtplib.SMTP(
+        hostname=settings.smtp_host,
+        port=settings.smtp_port,
+        username=settings.smtp_user,
+        password=settings.smtp_password,
+        start_tls=True,
+    )
+    await client.connect()
+    return client
+
+
+class _SMTPConnectionPool:
+    """Authenticated SMTP connections kept open between sends.
+
+    A connection carries one message at a time. Idle ones are reused so a burst of
+    notifications doesn't pay a TCP, STARTTLS and AUTH handshake per email.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.loop = asyncio.get_running_loop()
+        self._idle: list[aiosmtplib.SMTP] = []
+
+    async def send(self, message: MIMEMultipart) -> None:
+        import aiosmtplib
+
+        while self._idle:
+            client = self._idle.pop()
+            if not client.is_connected:
+                continue
+            try:
+                await client.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server dropped the idle connection before taking the message
+                continue
+            except BaseException:
+                client.close()
+                raise
+            self._release(client)
+            return
+
+        client = await _smtp_connect(self.settings)
+        try:
+            await client.send_message(message)
+        except BaseException:
+            client.close()
+            raise
+        self._release(client)
+
+    def _release(self, client: "aiosmtplib.SMTP") -> None:
+        if len(self._idle) < self.settings.email_send_concurrency:
+            self._idle.append(client)
+        else:
+            client.close()
+
+    async def close(self) -> None:
+        import aiosmtplib
+
+        idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+_smtp_pools: dict[tuple[str, int, str], _SMTPConnectionPool] = {}
+
+
+def _get_smtp_pool(settings: Settings) -> _SMTPConnectionPool:
+    key = (settings.smtp_host, settings.smtp_port, settings.smtp_user)
+    pool = _smtp_pools.get(key)
+    # Connections belong to the loop that opened them; the CLI runs a loop per command
+    if pool is None or pool.loop is not asyncio.get_running_loop():
+        pool = _smtp_pools[key] = _SMTPConnectionPool(settings)
+    return pool
+
+
+async def close_email_connections() -> None:
+    """Close pooled SMTP connections. Called on application shutdown."""
+    pools = list(_smtp_pools.values())
+    _smtp_pools.clear()
+    for pool in pools:
+        await pool.close()
+
 
 class SMTPProvider(EmailProvider):
     def __init__(self, settings: Settings):
@@ -98,20 +247,21 @@ class SMTPProvider(EmailProvider):
                 message.attach(MIMEText(text_body, "plain"))
             message.attach(MIMEText(html_body, "html"))
 
-            await aiosmtplib.send(
-                message,
-                hostname=self.settings.smtp_host,
-                port=self.settings.smtp_port,
-                username=self.settings.smtp_user,
-                password=self.settings.smtp_password,
-                start_tls=True,
-            )
+            await _get_smtp_pool(self.settings).send(message)
             logger.info(f"Email sent successfully via SMTP to {to_email}")
             return True
         except Exception as e:
             logger.error(f"Failed to send email via SMTP: {e}")
             return False
 
+    async def ping(self) -> None:
+        # A fresh connection rather than a pooled one, so the handshake and login are tested
+        client = await _smtp_connect(self.settings)
+        try:
+            await client.noop()
+        finally:
+            await client.quit()
+
 
 class EmailService:
     def __init__(self, settings: Settings | None = None, db: AsyncSession | None = None):
@@ -124,13 +274,39 @@ class EmailService:
         else:
             self.provider = SMTPProvider(self.settings)
 
+    async def ping(self) -> None:
+        """Check the email provider is reachable. Raises on failure."""
+        await self.provider.ping()
+
     async def is_suppressed(self, email: str) -> bool:
         """Check if an email is on the suppression list."""
         if not self.db:
             return False
-        stmt = select(EmailSuppression).where(EmailSuppression.email == email.lower())
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none() is not None
+        email = email.lower()
+        if (suppressed := _suppression_cache.get(email)) is not None:
+            return suppressed
+
+        stmt = select(exists().where(EmailSuppression.email == email))
+        suppressed = bool(await self.db.scalar(stmt))
+        _suppression_cache.set(email, suppressed)
+        return suppressed
+
+    async def preload_suppressions(self, emails: Iterable[str]) -> None:
+        """Look up the suppression status of many addresses in one query.
+
+        Called before notifying a batch of recipients, so the per-recipient checks
+        that follow are answered from the cache instead of a query each.
+        """
+        if not self.db:
+            return
+        pending = {e for e in map(str.lower, emails) if _suppression_cache.get(e) is None}
+        if not pending:
+            return
+
+        stmt = select(EmailSuppression.email).where(EmailSuppression.email.in_(pending))
+        suppressed = set(await self.db.scalars(stmt))
+        for email in pending:
+            _suppression_cache.set(email, email in suppressed)
 
     async def add_suppression(
         self, email: str, reason: SuppressionReason, details: str | None = None
@@ -140,15 +316,26 @@ class EmailService:
             logger.warning(f"Cannot add suppression for {email}: no database session")
             return
         suppression = EmailSuppression(
-            id=uuid.uuid4(),
             email=email.lower(),
             reason=reason,
             details=details,
         )
         self.db.add(suppression)
         await self.db.flush()
+        _suppression_cache.set(email.lower(), True)
         logger.info(f"Added {email} to suppression list: {reason.value}")
 
+    async def for_background(self, to_email: str) -> "EmailService | None":
+        """Return a session-free copy for sending to `to_email` after the response.
+
+        Background tasks run once the request's session is closed, so the
+        suppression check happens here instead. Returns None if suppressed.
+        """
+        if await self.is_suppressed(to_email):
+            logger.warning(f"Email to {to_email} blocked: address is suppressed")
+            return None
+        return EmailService(settings=self.settings)
+
     async def _send_with_suppression_check(
         self, to_email: str, subject: str, html_body: str, text_body: str | None = None
     ) -> bool:
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from gatekeeper.config import Settings, get_settings
 from gatekeeper.models.otp import MAX_OTP_ATTEMPTS, OTP, OTPPurpose
+from gatekeeper.models.user import User
 from gatekeeper.services.email import EmailService
 
 
@@ -38,20 +39,24 @@ class OTPService:
         purpose_text = "sign in" if purpose == OTPPurpose.SIGNIN else "register"
         return await self.email_service.send_otp(email, code, purpose_text)
 
-    async def verify(self, email: str, code: str, purpose: OTPPurpose) -> tuple[bool, str | None]:
+    async def verify(
+        self, email: str, code: str, purpose: OTPPurpose
+    ) -> tuple[bool, str | None, User | None]:
         """
         Verify an OTP code.
 
         Returns:
-            tuple: (success, error_message)
-            - (True, None) on success
-            - (False, "error message") on failure
+            tuple: (success, error_message, user)
+            - (True, None, user) on success, user being None if no account has this email
+            - (False, "error message", None) on failure
         """
         email = email.lower()
 
-        # Find the most recent unused, unexpired OTP for this email/purpose
+        # Find the most recent unused, unexpired OTP for this email/purpose, along with
+        # the account it belongs to so callers don't look it up again
         stmt = (
-            select(OTP)
+            select(OTP, User)
+            .outerjoin(User, User.email == OTP.email)
             .where(
                 OTP.email == email,
                 OTP.purpose == purpose,
@@ -62,14 +67,15 @@ class OTPService:
             .limit(1)
         )
         result = await self.db.execute(stmt)
-        otp = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if not otp:
-            return False, "Invalid or expired code. Please request a new one."
+        if not row:
+            return False, "Invalid or expired code. Please request a new one.", None
+        otp, user = row
 
         # Check if max attempts exceeded
         if otp.attempts >= MAX_OTP_ATTEMPTS:
-            return False, "Too many failed attempts. Please request a new code."
+            return False, "Too many failed attempts. Please request a new code.", None
 
         # Check if code matches
         if otp.code != code:
@@ -77,13 +83,13 @@ class OTPService:
             await self.db.flush()
             remaining = MAX_OTP_ATTEMPTS - otp.attempts
             if remaining <= 0:
-                return False, "Too many failed attempts. Please request a new code."
-            return False, f"Invalid code. {remaining} attempt(s) remaining."
+                return False, "Too many failed attempts. Please request a new code.", None
+            return False, f"Invalid code. {remaining} attempt(s) remaining.", None
 
         # Success - mark as used
         otp.used = True
         await self.db.flush()
-        return True, None
+        return True, None, user
 
     async def _invalidate_previous(self, email: str, purpose: OTPPurpose) -> None:
         stmt = select(OTP).where(
@@ -1,8 +1,14 @@
-import base64
+import hashlib
+import hmac
+import json
+import secrets
+import struct
+import time
 import uuid
+from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from webauthn import (
     generate_authentication_options,
@@ -19,15 +25,99 @@ from webauthn.helpers.structs import (
 )
 
 from gatekeeper.config import Settings, get_settings
-from gatekeeper.models.passkey import PasskeyCredential
+from gatekeeper.database import dialect_insert
+from gatekeeper.models.passkey import PasskeyCredential, SpentPasskeyChallenge
 from gatekeeper.models.user import User
+from gatekeeper.services.session import utcnow
+from gatekeeper.utils.security import b64url_decode
+
+# Challenges are self-validating: a random nonce and an expiry, signed with SECRET_KEY and
+# bound to the ceremony (and user, for registration). Nothing is stored when options are
+# issued; the browser echoes the challenge back in clientDataJSON. Only redeemed nonces
+# are recorded, in spent_passkey_challenges, so each challenge is usable once.
+CHALLENGE_TTL_SECONDS = 300
+_NONCE_BYTES = 16
+_MAC_BYTES = 16
+_EXPIRY = struct.Struct(">Q")
+_AUTHENTICATION_CONTEXT = "authenticate"
+
+
+def _registration_context(user_id: uuid.UUID) -> str:
+    return f"register:{user_id}"
+
+
+def _challenge_mac(body: bytes, context: str) -> bytes:
+    key = get_settings().secret_key.encode()
+    message = context.encode() + b"\x00" + body
+    return hmac.new(key, message, hashlib.sha256).digest()[:_MAC_BYTES]
+
+
+def _issue_challenge(context: str) -> bytes:
+    expires_at = int(time.time()) + CHALLENGE_TTL_SECONDS
+    body = secrets.token_bytes(_NONCE_BYTES) + _EXPIRY.pack(expires_at)
+    return body + _challenge_mac(body, context)
+
+
+async def _redeem_challenge(db: AsyncSession, challenge: str, context: str) -> bytes | None:
+    try:
+        raw = b64url_decode(challenge)
+    except ValueError:
+        return None
+
+    body, mac = raw[:-_MAC_BYTES], raw[-_MAC_BYTES:]
+    if len(body) != _NONCE_BYTES + _EXPIRY.size:
+        return None
+    if not hmac.compare_digest(mac, _challenge_mac(body, context)):
+        return None
+
+    (expires_at,) = _EXPIRY.unpack_from(body, _NONCE_BYTES)
+    if expires_at < time.time():
+        return None
+
+    # Each challenge is usable once. The nonce's primary key lets exactly one
+    # redemption record it, whichever worker it lands on; a concurrent one waits
+    # for that transaction and then finds the conflict.
+    await db.execute(
+        delete(SpentPasskeyChallenge).where(SpentPasskeyChallenge.expires_at < utcnow())
+    )
+    stmt = (
+        dialect_insert(db)(SpentPasskeyChallenge)
+        .values(
+            nonce=body[:_NONCE_BYTES],
+            expires_at=datetime.fromtimestamp(expires_at, UTC).replace(tzinfo=None),
+        )
+        .on_conflict_do_nothing()
+        .returning(SpentPasskeyChallenge.nonce)
+    )
+    result = await db.execute(stmt)
+    if result.first() is None:
+        return None
+    return raw
+
+
+def client_data_challenge(credential: dict[str, Any]) -> str:
+    """Read the base64url challenge the browser signed from a credential's clientDataJSON.
+
+    Raises ValueError (or a subclass) if clientDataJSON is missing or malformed.
+    """
+    client_data = credential.get("response", {}).get("clientDataJSON", "")
+    return json.loads(b64url_decode(client_data)).get("challenge", "")
 
 
 class PasskeyService:
     def __init__(self, db: AsyncSession, settings: Settings | None = None):
         self.db = db
         self.settings = settings or get_settings()
-        self._challenges: dict[str, bytes] = {}
+
+    async def redeem_registration_challenge(
+        self, user_id: uuid.UUID, challenge: str
+    ) -> bytes | None:
+        """Check a registration challenge issued to this user; each one is usable once."""
+        return await _redeem_challenge(self.db, challenge, _registration_context(user_id))
+
+    async def redeem_authentication_challenge(self, challenge: str) -> bytes | None:
+        """Check a sign-in challenge by its base64url form; each one is usable once."""
+        return await _redeem_challenge(self.db, challenge, _AUTHENTICATION_CONTEXT)
 
     async def generate_registration_options(self, user: User) -> dict[str, Any]:
         existing_credentials = await self._get_user_credentials(user.id)
@@ -42,6 +132,7 @@ class PasskeyService:
             user_id=str(user.id).encode(),
             user_name=user.email,
             user_display_name=user.email,
+            challenge=_issue_challenge(_registration_context(user.id)),
             exclude_credentials=exclude_credentials,
             authenticator_selection=AuthenticatorSelectionCriteria(
                 resident_key=ResidentKeyRequirement.PREFERRED,
@@ -49,8 +140,6 @@ class PasskeyService:
             ),
         )
 
-        self._challenges[str(user.id)] = options.challenge
-
         return {
             "challenge": bytes_to_base64url(options.challenge),
             "rp": {"id": options.rp.id, "name": options.rp.name},
@@ -81,8 +170,13 @@ class PasskeyService:
     async def verify_registration(
         self, user: User, credential: dict[str, Any], name: str = "Passkey"
     ) -> PasskeyCredential | None:
-        """Legacy method - uses instance-level challenge storage (doesn't work across requests)."""
-        challenge = self._challenges.pop(str(user.id), None)
+        """Verify registration against the challenge issued by generate_registration_options."""
+        try:
+            challenge = await self.redeem_registration_challenge(
+                user.id, client_data_challenge(credential)
+            )
+        except ValueError:
+            return None
         if not challenge:
             return None
 
@@ -138,6 +232,7 @@ class PasskeyService:
             rp_id=self.settings.webauthn_rp_id,
             allow_credentials=allow_credentials if allow_credentials else None,
             user_verification=UserVerificationRequirement.PREFERRED,
+            challenge=_issue_challenge(_AUTHENTICATION_CONTEXT),
         )
 
         return (
@@ -166,7 +261,7 @@ class PasskeyService:
             if not raw_id:
                 return None
 
-            credential_id = base64.urlsafe_b64decode(raw_id + "==")
+            credential_id = b64url_decode(raw_id)
 
             passkey = await self._get_credential_by_id(credential_id)
             if not passkey:
@@ -206,19 +301,13 @@ class PasskeyService:
         return result.scalar_one_or_none()
 
     async def delete_passkey(self, passkey_id: uuid.UUID, user_id: uuid.UUID) -> bool:
-        stmt = select(PasskeyCredential).where(
+        # A single DELETE; the row count says whether this user owned the passkey
+        stmt = delete(PasskeyCredential).where(
             PasskeyCredential.id == passkey_id,
             PasskeyCredential.user_id == user_id,
         )
         result = await self.db.execute(stmt)
-        passkey = result.scalar_one_or_none()
-
-        if not passkey:
-            return False
-
-        await self.db.delete(passkey)
-        await self.db.flush()
-        return True
+        return result.rowcount > 0
 
     async def list_passkeys(self, user_id: uuid.UUID) -> list[dict[str, Any]]:
         credentials = await self._get_user_credentials(user_id)
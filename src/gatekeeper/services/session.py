@@ -1,3 +1,4 @@
+import hashlib
 import secrets
 import uuid
 from datetime import datetime, timedelta
@@ -6,8 +7,25 @@ from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from gatekeeper.config import Settings, get_settings
+from gatekeeper.database import after_commit
 from gatekeeper.models.session import Session
 from gatekeeper.models.user import User
+from gatekeeper.utils.cache import TTLCache
+
+# Maps a hash of the session token to its user id, so authenticated requests
+# can skip the sessions table. Entries never outlive the session itself.
+_session_cache: TTLCache[str, uuid.UUID] = TTLCache(maxsize=10_000, ttl=30)
+
+# /validate outcomes, as (status code, headers), keyed on (token hash, app slug). nginx
+# asks again on every proxied request, so repeats are answered without the database.
+# Cleared whenever a user's access could change; otherwise trusted for the same
+# window as _session_cache.
+_access_decisions: TTLCache[tuple[str, str | None], tuple[int, dict[str, str]]] = TTLCache(
+    maxsize=50_000, ttl=30
+)
+# Bumped on every clear, so a decision read from the database before a change
+# isn't cached after it
+_access_generation = 0
 
 
 def utcnow() -> datetime:
@@ -15,6 +33,50 @@ def utcnow() -> datetime:
     return datetime.utcnow()
 
 
+def _cache_key(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+def get_access_decision(token: str, app_slug: str | None) -> tuple[int, dict[str, str]] | None:
+    return _access_decisions.get((_cache_key(token), app_slug))
+
+
+def access_decisions_generation() -> int:
+    """Read before looking up a decision, to pass to cache_access_decision."""
+    return _access_generation
+
+
+def cache_access_decision(
+    token: str,
+    app_slug: str | None,
+    decision: tuple[int, dict[str, str]],
+    session_expires_at: datetime,
+    generation: int,
+) -> None:
+    """Cache a /validate outcome until the TTL or the session's expiry, whichever is first.
+
+    Dropped if the cache was cleared since `generation` was read.
+    """
+    if generation != _access_generation:
+        return
+    remaining = (session_expires_at - utcnow()).total_seconds()
+    _access_decisions.set(
+        (_cache_key(token), app_slug),
+        decision,
+        ttl=min(get_settings().session_cache_ttl_seconds, remaining),
+    )
+
+
+def clear_access_decisions() -> None:
+    """Forget all cached /validate outcomes, after a change to users, apps or grants.
+
+    Call through `after_commit` from request handlers, so nothing re-caches the old rows.
+    """
+    global _access_generation
+    _access_generation += 1
+    _access_decisions.clear()
+
+
 class SessionService:
     def __init__(self, db: AsyncSession, settings: Settings | None = None):
         self.db = db
@@ -45,22 +107,48 @@ class SessionService:
         return result.scalar_one_or_none()
 
     async def get_user_by_token(self, token: str) -> User | None:
-        session = await self.get_by_token(token)
-        if not session:
-            return None
+        key = _cache_key(token)
+        user_id = _session_cache.get(key)
 
-        stmt = select(User).where(User.id == session.user_id)
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
+        if user_id is None:
+            session = await self.get_by_token(token)
+            if not session:
+                return None
+            user_id = session.user_id
+            remaining = (session.expires_at - utcnow()).total_seconds()
+            _session_cache.set(
+                key, user_id, ttl=min(self.settings.session_cache_ttl_seconds, remaining)
+            )
+
+        user = await self.db.get(User, user_id)
+        if not user:
+            _session_cache.pop(key)
+        return user
 
     async def delete(self, token: str) -> bool:
+        key = _cache_key(token)
+
+        def forget() -> None:
+            _session_cache.pop(key)
+            for decision_key, _ in _access_decisions.items():
+                if decision_key[0] == key:
+                    _access_decisions.pop(decision_key)
+
         stmt = delete(Session).where(Session.token == token)
         result = await self.db.execute(stmt)
+        after_commit(self.db, forget)
         return result.rowcount > 0
 
     async def delete_all_for_user(self, user_id: uuid.UUID) -> int:
+        def forget() -> None:
+            for key, cached_user_id in _session_cache.items():
+                if cached_user_id == user_id:
+                    _session_cache.pop(key)
+            clear_access_decisions()
+
         stmt = delete(Session).where(Session.user_id == user_id)
         result = await self.db.execute(stmt)
+        after_commit(self.db, forget)
         return result.rowcount
 
     async def cleanup_expired(self) -> int:
@@ -0,0 +1,59 @@
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALLOW_METHODS = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = "600"
+
+
+class SingleOriginCORSMiddleware:
+    """CORS for the one frontend origin, applied only to paths under `path_prefix`.
+
+    Gatekeeper only ever answers cross-origin requests from its own frontend, so the
+    origin check is a string comparison and the response headers are built once.
+    Requests from any other origin (or none) pass through untouched, which browsers
+    treat as a CORS refusal. Credentials are always allowed; requested headers are
+    echoed back on preflight.
+    """
+
+    def __init__(self, app: ASGIApp, origin: str, path_prefix: str = "/api/") -> None:
+        self.app = app
+        self.origin = origin
+        self.path_prefix = path_prefix
+        self._response_headers = [
+            (b"access-control-allow-origin", origin.encode("latin-1")),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self._preflight_headers = {
+            "Access-Control-Allow-Origin": origin,
+            "Access-Control-Allow-Credentials": "true",
+            "Access-Control-Allow-Methods": ALLOW_METHODS,
+            "Access-Control-Max-Age": PREFLIGHT_MAX_AGE,
+            "Vary": "Origin",
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if headers.get("origin") != self.origin:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and "access-control-request-method" in headers:
+            preflight_headers = self._preflight_headers
+            if requested := headers.get("access-control-request-headers"):
+                preflight_headers = preflight_headers | {"Access-Control-Allow-Headers": requested}
+            response = PlainTextResponse("OK", headers=preflight_headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *self._response_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
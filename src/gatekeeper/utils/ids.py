@@ -0,0 +1,15 @@
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """A version 7 UUID (RFC 9562): a 48-bit millisecond timestamp, then random bits.
+
+    Ids generated later sort later, so new rows land at the end of the primary key
+    index instead of on random pages throughout it.
+    """
+    value = bytearray((time.time_ns() // 1_000_000).to_bytes(6, "big") + os.urandom(10))
+    value[6] = (value[6] & 0x0F) | 0x70  # version 7
+    value[8] = (value[8] & 0x3F) | 0x80  # RFC 9562 variant
+    return uuid.UUID(bytes=bytes(value))
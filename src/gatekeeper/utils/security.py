@@ -1,22 +1,62 @@
 import base64
 import hashlib
 import hmac
+from functools import lru_cache
 
 from gatekeeper.config import get_settings
+from gatekeeper.utils.cache import TTLCache
+
+# Tokens signed with keyed BLAKE2b carry this prefix; unprefixed ones are legacy HMAC-SHA256
+TOKEN_VERSION_PREFIX = "v2."
+
+# Successful verifications keyed on (secret, cookie), so rotating SECRET_KEY misses naturally
+_verified_tokens: TTLCache[tuple[str, str], str] = TTLCache(maxsize=8192, ttl=3600)
+
+
+@lru_cache(maxsize=4)
+def _blake2b_key(secret_key: str) -> bytes:
+    # BLAKE2b keys are capped at 64 bytes, so derive a fixed-size key from the secret
+    return hashlib.blake2b(secret_key.encode()).digest()
+
+
+def _b64(signature: bytes) -> str:
+    return base64.urlsafe_b64encode(signature).decode().rstrip("=")
+
+
+def b64url_decode(value: str) -> bytes:
+    """Decode unpadded base64url, as used throughout WebAuthn payloads."""
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) & 3))
+
+
+def _blake2b_signature(secret_key: str, payload: str) -> str:
+    return _b64(
+        hashlib.blake2b(payload.encode(), key=_blake2b_key(secret_key), digest_size=32).digest()
+    )
+
+
+def _sha256_signature(secret_key: str, payload: str) -> str:
+    return _b64(hmac.new(secret_key.encode(), payload.encode(), hashlib.sha256).digest())
 
 
 def create_signed_token(token: str) -> str:
     settings = get_settings()
-    signature = hmac.new(
-        settings.secret_key.encode(),
-        token.encode(),
-        hashlib.sha256,
-    ).digest()
-    sig_b64 = base64.urlsafe_b64encode(signature).decode().rstrip("=")
-    return f"{token}.{sig_b64}"
+    payload = f"{TOKEN_VERSION_PREFIX}{token}"
+    return f"{payload}.{_blake2b_signature(settings.secret_key, payload)}"
 
 
 def verify_signed_token(signed_token: str) -> str | None:
+    settings = get_settings()
+    cache_key = (settings.secret_key, signed_token)
+    if (token := _verified_tokens.get(cache_key)) is not None:
+        return token
+
+    token = _verify_signed_token(settings.secret_key, signed_token)
+    if token is not None:
+        _verified_tokens.set(cache_key, token)
+    return token
+
+
+def _verify_signed_token(secret_key: str, signed_token: str) -> str | None:
     if "." not in signed_token:
         return None
 
@@ -24,16 +64,16 @@ def verify_signed_token(signed_token: str) -> str | None:
     if len(parts) != 2:
         return None
 
-    token, provided_sig = parts
+    payload, provided_sig = parts
 
-    settings = get_settings()
-    expected_signature = hmac.new(
-        settings.secret_key.encode(),
-        token.encode(),
-        hashlib.sha256,
-    ).digest()
-    expected_sig_b64 = base64.urlsafe_b64encode(expected_signature).decode().rstrip("=")
-
-    if hmac.compare_digest(provided_sig, expected_sig_b64):
+    if payload.startswith(TOKEN_VERSION_PREFIX):
+        token = payload.removeprefix(TOKEN_VERSION_PREFIX)
+        expected_sig = _blake2b_signature(secret_key, payload)
+    else:
+        # Cookies issued before the switch to BLAKE2b
+        token = payload
+        expected_sig = _sha256_signature(secret_key, payload)
+
+    if hmac.compare_digest(provided_sig, expected_sig):
         return token
     return None
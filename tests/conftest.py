@@ -62,6 +62,8 @@ async def client(test_engine, test_session, test_db_path) -> AsyncGenerator[Asyn
     from gatekeeper.config import Settings, get_settings
     from gatekeeper.main import app
     from gatekeeper.rate_limit import limiter
+    from gatekeeper.services.admin_cache import clear_access_request_lists, clear_admin_emails
+    from gatekeeper.services.session import clear_access_decisions
 
     # Create test settings with the temp database
     db_url = f"sqlite+aiosqlite:///{test_db_path}"
@@ -103,6 +105,11 @@ async def client(test_engine, test_session, test_db_path) -> AsyncGenerator[Asyn
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_settings] = override_get_settings
 
+    # In-process caches outlive the per-test database, so start each test without them
+    clear_access_decisions()
+    clear_access_request_lists()
+    clear_admin_emails()
+
     # Disable rate limiting for tests
     limiter.enabled = False
 
@@ -2,9 +2,14 @@
 Tests for authentication flows.
 """
 
+import base64
+import json
+
 from httpx import AsyncClient
+from sqlalchemy import func, select
 
 from gatekeeper.models.otp import OTPPurpose
+from gatekeeper.models.passkey import PasskeyCredential, SpentPasskeyChallenge
 from gatekeeper.models.user import UserStatus
 
 from .conftest import create_test_otp, create_test_user, get_latest_otp
@@ -41,6 +46,51 @@ class TestRegistration:
         assert response.status_code == 400
         assert "already registered" in response.json()["detail"].lower()
 
+    async def test_register_normalizes_email_case(self, client: AsyncClient, db_session):
+        """Test that mixed-case emails match the lowercased stored address."""
+        await create_test_user(db_session, "casing@test.com", UserStatus.APPROVED)
+
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": "Casing@Test.com"},
+        )
+
+        assert response.status_code == 400
+        assert "already registered" in response.json()["detail"].lower()
+
+    async def test_register_rejects_malformed_email(self, client: AsyncClient):
+        """Test that malformed email addresses fail request validation."""
+        malformed = (
+            "not-an-email",
+            "user@nodot",
+            "us er@test.com",
+            "x@test.com\r\nBcc: y@z.com",
+            # Address-list separators and quoting, which would add recipients to a To header
+            "a,b@test.com",
+            "a;b@test.com",
+            '"x"<y>@test.com',
+            "(c)a@test.com",
+            # Empty domain labels
+            "a@.test.com",
+            "a@test..com",
+            "a@test.com.",
+        )
+        for email in malformed:
+            response = await client.post("/api/v1/auth/register", json={"email": email})
+            assert response.status_code == 422, email
+
+    def test_accepted_domains_follow_settings_copies(self):
+        """Test that a settings copy with other accepted domains checks against those."""
+        from gatekeeper.config import Settings
+
+        settings = Settings(secret_key="x" * 32, accepted_domains="Test.com")
+        assert settings.is_accepted_domain("user@test.com")
+
+        copy = settings.model_copy(update={"accepted_domains": "z.com"})
+        assert copy.accepted_domains_list == ["z.com"]
+        assert copy.is_accepted_domain("user@z.com")
+        assert not copy.is_accepted_domain("user@test.com")
+
     async def test_register_existing_pending_user_fails(self, client: AsyncClient, db_session):
         """Test that registration fails for a pending user."""
         await create_test_user(db_session, "pending@test.com", UserStatus.PENDING)
@@ -362,6 +412,87 @@ class TestAdminEndpoints:
 
         assert response.status_code == 200
 
+    async def test_admin_list_users_pagination_total(self, client: AsyncClient, db_session):
+        """Test that the user list total is correct on and past the last page."""
+        admin = await create_test_user(
+            db_session,
+            "pageadmin@approved-domain.com",
+            UserStatus.APPROVED,
+            is_admin=True,
+        )
+        await create_test_user(db_session, "page1@test.com", UserStatus.APPROVED)
+        await create_test_user(db_session, "page2@test.com", UserStatus.PENDING)
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        signin_response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = signin_response.cookies
+
+        response = await client.get("/api/v1/admin/users", params={"page_size": 2}, cookies=cookies)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["users"]) == 2
+        assert data["total"] == 3
+
+        response = await client.get(
+            "/api/v1/admin/users", params={"page": 5, "page_size": 2}, cookies=cookies
+        )
+        data = response.json()
+        assert data["users"] == []
+        assert data["total"] == 3
+
+        response = await client.get(
+            "/api/v1/admin/users", params={"status_filter": "pending"}, cookies=cookies
+        )
+        data = response.json()
+        assert [u["email"] for u in data["users"]] == ["page2@test.com"]
+        assert data["total"] == 1
+
+        response = await client.get("/api/v1/admin/users/pending", cookies=cookies)
+        data = response.json()
+        assert [u["email"] for u in data["users"]] == ["page2@test.com"]
+        assert data["users"][0]["status"] == "pending"
+        assert data["total"] == 1
+
+    async def test_admin_create_and_update_user_timestamps(self, client: AsyncClient, db_session):
+        """Test that server-generated timestamps are returned without a refresh."""
+        admin = await create_test_user(
+            db_session,
+            "tsadmin@approved-domain.com",
+            UserStatus.APPROVED,
+            is_admin=True,
+        )
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        signin_response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = signin_response.cookies
+
+        response = await client.post(
+            "/api/v1/admin/users",
+            json={"email": "newuser@test.com", "auto_approve": False},
+            cookies=cookies,
+        )
+        assert response.status_code == 201
+        created = response.json()
+        assert created["created_at"]
+        assert created["updated_at"]
+
+        response = await client.patch(
+            f"/api/v1/admin/users/{created['id']}",
+            json={"is_admin": True},
+            cookies=cookies,
+        )
+        assert response.status_code == 200
+        assert response.json()["is_admin"] is True
+        assert response.json()["updated_at"]
+
 
 class TestSignOut:
     """Tests for sign-out functionality."""
@@ -396,3 +527,177 @@ class TestSignOut:
         # Try to access /me - should fail
         me_response = await client.get("/api/v1/auth/me")
         assert me_response.status_code == 401
+
+    async def test_signout_invalidates_session_cookie(self, client: AsyncClient, db_session):
+        """Test that a signed-out session cookie cannot be reused."""
+        email = "signoutreuse@approved-domain.com"
+
+        await client.post(
+            "/api/v1/auth/register",
+            json={"email": email},
+        )
+        otp = await get_latest_otp(db_session, email, OTPPurpose.REGISTER)
+
+        register_response = await client.post(
+            "/api/v1/auth/register/verify",
+            json={"email": email, "code": otp},
+        )
+        cookies = register_response.cookies
+
+        # Warm the session cache
+        me_response = await client.get("/api/v1/auth/me", cookies=cookies)
+        assert me_response.status_code == 200
+
+        signout_response = await client.post(
+            "/api/v1/auth/signout",
+            cookies=cookies,
+        )
+        assert signout_response.status_code == 200
+
+        me_response = await client.get("/api/v1/auth/me", cookies=cookies)
+        assert me_response.status_code == 401
+
+
+def _passkey_credential(challenge: str) -> dict:
+    client_data = json.dumps({"type": "webauthn.get", "challenge": challenge}).encode()
+    return {
+        "id": "AAAA",
+        "rawId": "AAAA",
+        "type": "public-key",
+        "response": {
+            "clientDataJSON": base64.urlsafe_b64encode(client_data).decode().rstrip("="),
+            "authenticatorData": "",
+            "signature": "",
+        },
+    }
+
+
+class TestPasskeyChallenges:
+    """Tests for signed, single-use passkey challenges."""
+
+    async def test_signin_challenge_is_signed_and_single_use(self, client: AsyncClient, db_session):
+        """Test that only an issued challenge is accepted, and only once."""
+        options = await client.post("/api/v1/auth/passkey/signin/options", json={})
+        assert options.status_code == 200
+        challenge = options.json()["challenge"]
+
+        # A challenge the server never issued is rejected before any credential lookup
+        forged = challenge[:-2] + ("AA" if not challenge.endswith("AA") else "BB")
+        response = await client.post(
+            "/api/v1/auth/passkey/signin/verify",
+            json={"credential": _passkey_credential(forged)},
+        )
+        assert response.status_code == 400
+        assert "challenge" in response.json()["detail"].lower()
+
+        # The issued challenge passes, failing later on the unknown credential
+        response = await client.post(
+            "/api/v1/auth/passkey/signin/verify",
+            json={"credential": _passkey_credential(challenge)},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Passkey authentication failed."
+
+        # And cannot be redeemed a second time
+        response = await client.post(
+            "/api/v1/auth/passkey/signin/verify",
+            json={"credential": _passkey_credential(challenge)},
+        )
+        assert response.status_code == 400
+        assert "challenge" in response.json()["detail"].lower()
+
+        # The spent nonce is in the database, where every worker checks it
+        spent = select(func.count()).select_from(SpentPasskeyChallenge)
+        assert await db_session.scalar(spent) == 1
+
+
+class TestPasskeyManagement:
+    """Tests for listing and deleting passkeys."""
+
+    async def test_delete_passkey(self, client: AsyncClient, db_session):
+        """Test that users can delete their own passkeys and no one else's."""
+        owner = await create_test_user(db_session, "owner@test.com", UserStatus.APPROVED)
+        other = await create_test_user(db_session, "other@test.com", UserStatus.APPROVED)
+        passkey = PasskeyCredential(user_id=owner.id, credential_id=b"cred", public_key=b"key")
+        db_session.add(passkey)
+        await db_session.commit()
+        await db_session.refresh(passkey)
+
+        cookies = {}
+        for user in (owner, other):
+            await create_test_otp(db_session, user.email, "123456", OTPPurpose.SIGNIN)
+            response = await client.post(
+                "/api/v1/auth/signin/verify",
+                json={"email": user.email, "code": "123456"},
+            )
+            cookies[user.email] = response.cookies
+
+        invalid = await client.delete(
+            "/api/v1/auth/passkeys/not-a-uuid", cookies=cookies[owner.email]
+        )
+        assert invalid.status_code == 400
+
+        not_theirs = await client.delete(
+            f"/api/v1/auth/passkeys/{passkey.id}", cookies=cookies[other.email]
+        )
+        assert not_theirs.status_code == 404
+
+        deleted = await client.delete(
+            f"/api/v1/auth/passkeys/{passkey.id}", cookies=cookies[owner.email]
+        )
+        assert deleted.status_code == 200
+
+        listed = await client.get("/api/v1/auth/passkeys", cookies=cookies[owner.email])
+        assert listed.json() == []
+
+
+class TestCORS:
+    """Tests for cross-origin requests from the frontend."""
+
+    async def test_preflight_from_frontend(self, client: AsyncClient):
+        """Test that a preflight from the frontend origin is answered with credentials."""
+        response = await client.options(
+            "/api/v1/auth/signin",
+            headers={
+                "Origin": "http://localhost:4321",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "content-type",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:4321"
+        assert response.headers["access-control-allow-credentials"] == "true"
+        assert response.headers["access-control-allow-headers"] == "content-type"
+        assert "POST" in response.headers["access-control-allow-methods"]
+
+    async def test_cors_headers_only_for_frontend_api_requests(self, client: AsyncClient):
+        """Test that other origins and non-API paths get no CORS headers."""
+        allowed = await client.get("/api/v1/auth/me", headers={"Origin": "http://localhost:4321"})
+        assert allowed.status_code == 401
+        assert allowed.headers["access-control-allow-origin"] == "http://localhost:4321"
+
+        other = await client.get("/api/v1/auth/me", headers={"Origin": "https://evil.example"})
+        assert "access-control-allow-origin" not in other.headers
+
+        health = await client.get("/health", headers={"Origin": "http://localhost:4321"})
+        assert health.status_code == 200
+        assert "access-control-allow-origin" not in health.headers
+
+
+class TestStaticFiles:
+    """Tests for the bundled static assets."""
+
+    async def test_favicon_served_from_memory(self, client: AsyncClient):
+        """Test that the favicon redirect resolves and unknown paths 404."""
+        redirect = await client.get("/favicon.ico")
+        assert redirect.status_code == 307
+        assert redirect.headers["location"] == "/static/favicon.svg"
+
+        response = await client.get("/static/favicon.svg")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/svg+xml"
+        assert response.content.startswith(b"<svg")
+
+        missing = await client.get("/static/../config.py")
+        assert missing.status_code == 404
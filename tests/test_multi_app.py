@@ -2,10 +2,13 @@
 Tests for multi-app functionality.
 """
 
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from gatekeeper.models.app import App, UserAppAccess
+from gatekeeper.models.app import AccessRequestStatus, App, AppAccessRequest, UserAppAccess
 from gatekeeper.models.otp import OTPPurpose
 from gatekeeper.models.user import UserStatus
 
@@ -240,6 +243,217 @@ class TestValidateEndpoint:
         assert validate_response.headers.get("X-Auth-User") == user.email
         assert validate_response.headers.get("X-Auth-Role") is None
 
+    async def test_validate_reflects_revoked_access(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test that revoking access takes effect even after validate answered before."""
+        app = await create_test_app(db_session, "revoked-app", "Revoked App")
+        user = await create_test_user(
+            db_session, "revoked@approved-domain.com", UserStatus.APPROVED
+        )
+        admin = await create_test_user(
+            db_session, "revoke-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        await grant_app_access(db_session, user.id, app.id, role="viewer")
+
+        cookies = {}
+        for account in (user, admin):
+            await client.post("/api/v1/auth/signin", json={"email": account.email})
+            otp = await get_latest_otp(db_session, account.email, OTPPurpose.SIGNIN)
+            response = await client.post(
+                "/api/v1/auth/signin/verify",
+                json={"email": account.email, "code": otp},
+            )
+            cookies[account.email] = response.cookies
+
+        for _ in range(2):
+            validate_response = await client.get(
+                "/api/v1/auth/validate",
+                cookies=cookies[user.email],
+                headers={"X-GK-App": app.slug},
+            )
+            assert validate_response.status_code == 200
+            assert validate_response.headers.get("X-Auth-Role") == "viewer"
+
+        revoke_response = await client.delete(
+            f"/api/v1/admin/apps/{app.slug}/revoke",
+            params={"email": user.email},
+            cookies=cookies[admin.email],
+        )
+        assert revoke_response.status_code == 200
+
+        validate_response = await client.get(
+            "/api/v1/auth/validate",
+            cookies=cookies[user.email],
+            headers={"X-GK-App": app.slug},
+        )
+        assert validate_response.status_code == 403
+
+    async def test_cached_decisions_cleared_only_after_commit(self, db_session: AsyncSession):
+        """Test that a decision cached before the change commits doesn't survive it."""
+        from gatekeeper.database import after_commit
+        from gatekeeper.services.session import (
+            access_decisions_generation,
+            cache_access_decision,
+            clear_access_decisions,
+            get_access_decision,
+            utcnow,
+        )
+
+        expires_at = utcnow() + timedelta(days=1)
+        after_commit(db_session, clear_access_decisions)
+        generation = access_decisions_generation()
+        cache_access_decision("token", "app", (200, {}), expires_at, generation)
+        assert get_access_decision("token", "app") == (200, {})
+
+        await db_session.commit()
+        assert get_access_decision("token", "app") is None
+
+    def test_decision_read_before_a_clear_is_not_cached(self):
+        """Test that a /validate lookup racing a clear doesn't cache its stale answer."""
+        from gatekeeper.services.session import (
+            access_decisions_generation,
+            cache_access_decision,
+            clear_access_decisions,
+            get_access_decision,
+            utcnow,
+        )
+
+        expires_at = utcnow() + timedelta(days=1)
+        generation = access_decisions_generation()
+        clear_access_decisions()
+        cache_access_decision("token", "app", (200, {}), expires_at, generation)
+        assert get_access_decision("token", "app") is None
+
+        # Nor past the end of the session it was made for
+        generation = access_decisions_generation()
+        cache_access_decision("token", "app", (200, {}), utcnow(), generation)
+        assert get_access_decision("token", "app") is None
+
+
+class TestRequestAppAccess:
+    async def test_request_app_access(self, client: AsyncClient, db_session: AsyncSession):
+        """Test requesting access, including duplicate requests and existing access."""
+        user = await create_test_user(
+            db_session, "requester@approved-domain.com", UserStatus.APPROVED
+        )
+        app = await create_test_app(db_session, "request-app", "Request App")
+        granted_app = await create_test_app(db_session, "granted-app", "Granted App")
+        await grant_app_access(db_session, user.id, granted_app.id)
+
+        await client.post("/api/v1/auth/signin", json={"email": user.email})
+        otp = await get_latest_otp(db_session, user.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": user.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        missing = await client.post("/api/v1/auth/me/apps/no-such-app/request", cookies=cookies)
+        assert missing.status_code == 404
+
+        granted = await client.post(
+            f"/api/v1/auth/me/apps/{granted_app.slug}/request", cookies=cookies
+        )
+        assert granted.status_code == 400
+        assert granted.json()["detail"] == "You already have access to this app."
+
+        first = await client.post(f"/api/v1/auth/me/apps/{app.slug}/request", cookies=cookies)
+        assert first.status_code == 200
+
+        repeat = await client.post(f"/api/v1/auth/me/apps/{app.slug}/request", cookies=cookies)
+        assert repeat.status_code == 400
+        assert repeat.json()["detail"] == "You already have a pending request for this app."
+
+    async def test_new_request_appears_in_cached_admin_list(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test that filing a request clears the admin's cached request list."""
+        user = await create_test_user(
+            db_session, "listed-requester@approved-domain.com", UserStatus.APPROVED
+        )
+        admin = await create_test_user(
+            db_session, "list-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        app = await create_test_app(db_session, "listed-app", "Listed App")
+
+        cookies = {}
+        for account in (user, admin):
+            await client.post("/api/v1/auth/signin", json={"email": account.email})
+            otp = await get_latest_otp(db_session, account.email, OTPPurpose.SIGNIN)
+            response = await client.post(
+                "/api/v1/auth/signin/verify",
+                json={"email": account.email, "code": otp},
+            )
+            cookies[account.email] = response.cookies
+
+        before = await client.get("/api/v1/admin/requests", cookies=cookies[admin.email])
+        assert before.status_code == 200
+
+        response = await client.post(
+            f"/api/v1/auth/me/apps/{app.slug}/request", cookies=cookies[user.email]
+        )
+        assert response.status_code == 200
+
+        after = await client.get("/api/v1/admin/requests", cookies=cookies[admin.email])
+        assert [(r["user_email"], r["app_slug"]) for r in after.json()] == [(user.email, app.slug)]
+
+
+class TestAppDiscovery:
+    async def test_public_private_and_my_apps(self, client: AsyncClient, db_session: AsyncSession):
+        """Test the app lists a signed-in user sees."""
+        user = await create_test_user(
+            db_session, "browser@approved-domain.com", UserStatus.APPROVED
+        )
+        public_app = await create_test_app(db_session, "public-app", "Public App")
+        public_app.is_public = True
+        public_app.app_url = "https://public.example.com"
+        granted_app = await create_test_app(db_session, "granted-app", "Granted App")
+        await create_test_app(db_session, "other-app", "Other App")
+        await db_session.commit()
+        await grant_app_access(db_session, user.id, granted_app.id, role="editor")
+
+        await client.post("/api/v1/auth/signin", json={"email": user.email})
+        otp = await get_latest_otp(db_session, user.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": user.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        public = await client.get("/api/v1/auth/apps/public")
+        assert public.status_code == 200
+        assert public.json() == [
+            {
+                "slug": "public-app",
+                "name": "Public App",
+                "description": None,
+                "app_url": "https://public.example.com",
+            }
+        ]
+
+        private = await client.get("/api/v1/auth/apps/private", cookies=cookies)
+        assert private.status_code == 200
+        assert [app["slug"] for app in private.json()] == ["other-app"]
+
+        mine = await client.get("/api/v1/auth/me/apps", cookies=cookies)
+        assert mine.status_code == 200
+        assert [(app["app_slug"], app["role"]) for app in mine.json()] == [
+            ("granted-app", "editor"),
+            ("public-app", "user"),
+        ]
+
+    def test_discovery_columns_match_schema_fields(self):
+        """Test that the columns built into discovery responses unvalidated match the schemas."""
+        from gatekeeper.api.v1.auth import _APP_PUBLIC_COLUMNS, _MY_APP_COLUMNS
+        from gatekeeper.schemas.app import AppPublic
+        from gatekeeper.schemas.auth import UserAppAccessInfo
+
+        assert {c.key for c in _APP_PUBLIC_COLUMNS} == set(AppPublic.model_fields)
+        assert {c.key for c in _MY_APP_COLUMNS} | {"role", "granted_at"} == set(
+            UserAppAccessInfo.model_fields
+        )
+
 
 class TestAdminAppEndpoints:
     """Tests for admin app management endpoints."""
@@ -290,6 +504,29 @@ class TestAdminAppEndpoints:
         assert data["slug"] == "test-app"
         assert data["name"] == "Test App"
 
+    async def test_list_apps_as_admin(self, client: AsyncClient, db_session: AsyncSession):
+        """Test that admins can list apps."""
+        admin = await create_test_user(
+            db_session, "list-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        await create_test_app(db_session, "list-app-1", "List App 1")
+        await create_test_app(db_session, "list-app-2", "List App 2")
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        list_response = await client.get("/api/v1/admin/apps", cookies=cookies)
+        assert list_response.status_code == 200
+        data = list_response.json()
+        assert data["total"] == 2
+        assert {a["slug"] for a in data["apps"]} == {"list-app-1", "list-app-2"}
+        assert all(a["roles"] == "admin,user" for a in data["apps"])
+
     async def test_grant_and_revoke_access(self, client: AsyncClient, db_session: AsyncSession):
         """Test granting and revoking app access."""
         # Create admin and regular user
@@ -347,3 +584,204 @@ class TestAdminAppEndpoints:
         )
         users = app_detail.json()["users"]
         assert len(users) == 0
+
+    async def test_grant_updates_existing_role(self, client: AsyncClient, db_session: AsyncSession):
+        """Test that granting existing access changes the role, or fails if unchanged."""
+        admin = await create_test_user(
+            db_session, "role-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        user = await create_test_user(
+            db_session, "role-user@approved-domain.com", UserStatus.APPROVED
+        )
+        app = await create_test_app(db_session, "role-test-app", "Role Test App")
+        await grant_app_access(db_session, user.id, app.id, role="viewer")
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        grant_response = await client.post(
+            f"/api/v1/admin/apps/{app.slug}/grant",
+            json={"email": user.email, "role": "editor"},
+            cookies=cookies,
+        )
+        assert grant_response.status_code == 200
+        assert grant_response.json()["message"].startswith("Updated role")
+
+        repeat_response = await client.post(
+            f"/api/v1/admin/apps/{app.slug}/grant",
+            json={"email": user.email, "role": "editor"},
+            cookies=cookies,
+        )
+        assert repeat_response.status_code == 400
+
+        app_detail = await client.get(f"/api/v1/admin/apps/{app.slug}", cookies=cookies)
+        users = app_detail.json()["users"]
+        assert [(u["email"], u["role"]) for u in users] == [(user.email, "editor")]
+        assert users[0]["granted_by"] == admin.email
+
+    async def test_bulk_grant_skips_existing_access(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test that bulk grant only creates and notifies missing grants."""
+        admin = await create_test_user(
+            db_session, "bulk-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        user1 = await create_test_user(
+            db_session, "bulk-user1@approved-domain.com", UserStatus.APPROVED
+        )
+        user2 = await create_test_user(
+            db_session, "bulk-user2@approved-domain.com", UserStatus.APPROVED
+        )
+        app1 = await create_test_app(db_session, "bulk-app-1", "Bulk App 1")
+        app2 = await create_test_app(db_session, "bulk-app-2", "Bulk App 2")
+        await grant_app_access(db_session, user1.id, app1.id, role="viewer")
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        with patch(
+            "gatekeeper.services.email.EmailService.send_app_access_granted",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as send_mock:
+            bulk_response = await client.post(
+                "/api/v1/admin/users/grant-bulk",
+                json={
+                    "emails": [user1.email, user2.email],
+                    "app_slugs": [app1.slug, app2.slug],
+                    "role": "editor",
+                },
+                cookies=cookies,
+            )
+
+        assert bulk_response.status_code == 200
+        assert bulk_response.json()["message"].startswith("Created 3 access grant(s)")
+        assert send_mock.await_count == 3
+
+        app_detail = await client.get(f"/api/v1/admin/apps/{app1.slug}", cookies=cookies)
+        roles = {u["email"]: u["role"] for u in app_detail.json()["users"]}
+        assert roles == {user1.email: "viewer", user2.email: "editor"}
+
+    async def test_bulk_grant_collapses_duplicate_emails(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test that repeated or differently-cased emails produce a single grant."""
+        admin = await create_test_user(
+            db_session, "dup-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        user = await create_test_user(
+            db_session, "dup-user@approved-domain.com", UserStatus.APPROVED
+        )
+        app = await create_test_app(db_session, "dup-app", "Dup App")
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        with patch(
+            "gatekeeper.services.email.EmailService.send_app_access_granted",
+            new_callable=AsyncMock,
+            return_value=True,
+        ) as send_mock:
+            bulk_response = await client.post(
+                "/api/v1/admin/users/grant-bulk",
+                json={
+                    "emails": [user.email, user.email.upper()],
+                    "app_slugs": [app.slug, app.slug],
+                },
+                cookies=cookies,
+            )
+
+        assert bulk_response.status_code == 200
+        assert bulk_response.json()["message"].startswith("Created 1 access grant(s)")
+        assert send_mock.await_count == 1
+
+    async def test_approve_and_reject_access_requests(
+        self, client: AsyncClient, db_session: AsyncSession
+    ):
+        """Test reviewing access requests, including unknown apps and requests."""
+        admin = await create_test_user(
+            db_session, "review-admin@approved-domain.com", UserStatus.APPROVED, is_admin=True
+        )
+        user = await create_test_user(
+            db_session, "review-user@approved-domain.com", UserStatus.APPROVED
+        )
+        app = await create_test_app(db_session, "review-app", "Review App")
+        other_app = await create_test_app(db_session, "review-other-app", "Review Other App")
+        approve_req = AppAccessRequest(user_id=user.id, app_id=app.id)
+        reject_req = AppAccessRequest(user_id=user.id, app_id=other_app.id)
+        db_session.add_all([approve_req, reject_req])
+        await db_session.commit()
+
+        await client.post("/api/v1/auth/signin", json={"email": admin.email})
+        otp = await get_latest_otp(db_session, admin.email, OTPPurpose.SIGNIN)
+        response = await client.post(
+            "/api/v1/auth/signin/verify",
+            json={"email": admin.email, "code": otp},
+        )
+        cookies = response.cookies
+
+        pending = await client.get(f"/api/v1/admin/apps/{app.slug}/requests", cookies=cookies)
+        assert [r["id"] for r in pending.json()] == [str(approve_req.id)]
+        all_pending = await client.get("/api/v1/admin/requests", cookies=cookies)
+        assert sorted(r["app_slug"] for r in all_pending.json()) == [app.slug, other_app.slug]
+
+        missing_app = await client.post(
+            f"/api/v1/admin/apps/no-such-app/requests/{approve_req.id}/approve",
+            cookies=cookies,
+        )
+        assert missing_app.status_code == 404
+        assert missing_app.json()["detail"] == "App 'no-such-app' not found"
+
+        # A request only resolves under the app it was made for
+        wrong_app = await client.post(
+            f"/api/v1/admin/apps/{other_app.slug}/requests/{approve_req.id}/approve",
+            cookies=cookies,
+        )
+        assert wrong_app.status_code == 404
+        assert wrong_app.json()["detail"] == "Access request not found"
+
+        approve_response = await client.post(
+            f"/api/v1/admin/apps/{app.slug}/requests/{approve_req.id}/approve",
+            json={"role": "viewer"},
+            cookies=cookies,
+        )
+        assert approve_response.status_code == 200
+        assert user.email in approve_response.json()["message"]
+
+        pending = await client.get(f"/api/v1/admin/apps/{app.slug}/requests", cookies=cookies)
+        assert pending.json() == []
+
+        repeat_response = await client.post(
+            f"/api/v1/admin/apps/{app.slug}/requests/{approve_req.id}/reject",
+            cookies=cookies,
+        )
+        assert repeat_response.status_code == 400
+
+        reject_response = await client.post(
+            f"/api/v1/admin/apps/{other_app.slug}/requests/{reject_req.id}/reject",
+            cookies=cookies,
+        )
+        assert reject_response.status_code == 200
+
+        await db_session.refresh(reject_req)
+        assert reject_req.status == AccessRequestStatus.REJECTED
+        assert reject_req.reviewed_by == admin.email
+        assert reject_req.reviewed_at is not None
+        app_detail = await client.get(f"/api/v1/admin/apps/{app.slug}", cookies=cookies)
+        users = app_detail.json()["users"]
+        assert [(u["email"], u["role"]) for u in users] == [(user.email, "viewer")]